@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import threading
+import time
+
+from webview2 import DragMover, create_window, start_windows
+
+
+async def open_window(move_cost):
+    window = create_window("bench", "loopback://bench", hidden=True, backend="loopback")
+    await start_windows(window, join=False)
+
+    move = window.gui.move
+
+    def slow_move(dx, dy):
+        def run():
+            time.sleep(move_cost)
+            move(dx, dy)
+
+        window.gui.invoke(run)
+
+    window.gui.move = slow_move
+    return window
+
+
+def drive(mover, rate, duration):
+    period = 1 / rate
+    start = time.perf_counter()
+    x = 0
+
+    while time.perf_counter() - start < duration:
+        x += 1
+        timestamp = start + x * period
+        mover.feed(x, x, timestamp)
+
+        delay = timestamp + period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    return x
+
+
+async def bench(window, interval, rate, duration):
+    mover = DragMover(window, interval)
+    window.gui.move_abs(0, 0)
+    mover.reset_stats()
+
+    thread = threading.Thread(target=drive, args=(mover, rate, duration))
+    thread.start()
+    await asyncio.to_thread(thread.join)
+    await asyncio.sleep(max(interval or 0, 0.05) * 2)
+
+    stats = mover.stats()
+    stats["final_position"] = window.gui.position
+    stats["target"] = (mover.now_x, mover.now_y)
+    return stats
+
+
+async def run(args):
+    window = await open_window(args.move_cost / 1000)
+
+    for name, interval in (("direct", None), ("throttled", 1 / args.fps)):
+        stats = await bench(window, interval, args.rate, args.duration)
+        print(name)
+        for key, value in stats.items():
+            print(f"  {key:<20} {value}")
+
+    window.gui.close()
+    await window.closed.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="DragMover throughput and lag with synthetic move events"
+    )
+    parser.add_argument("--rate", type=int, default=1000, help="move events per sec")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument(
+        "--move-cost", type=float, default=2.0, help="simulated ms per window move"
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
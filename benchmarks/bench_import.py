@@ -0,0 +1,68 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+EAGER_FORBIDDEN = ("asyncio", "clr", "webview2.gui", "webview2.window")
+
+
+def import_time(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    for line in result.stderr.splitlines():
+        _, _, cumulative, name = (
+            part.strip() for part in line.replace(":", "|").split("|")
+        )
+        if name == module:
+            return int(cumulative) / 1000
+
+
+def loaded_modules():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, webview2; print('\\n'.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup cost of `import webview2`")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=5.0, help="median ms")
+    args = parser.parse_args()
+
+    samples = [import_time("webview2") for _ in range(args.runs)]
+    window = statistics.median(import_time("webview2.window") for _ in range(3))
+    median = statistics.median(samples)
+
+    print(f"{'import webview2 median ms':<40} {median:>10.2f}")
+    print(f"{'import webview2 max ms':<40} {max(samples):>10.2f}")
+    print(f"{'import webview2.window ms':<40} {window:>10.2f}")
+
+    failed = False
+    eager = sorted(loaded_modules().intersection(EAGER_FORBIDDEN))
+    if eager:
+        print(f"EAGER IMPORTS {', '.join(eager)}")
+        failed = True
+
+    if median > args.budget:
+        print(f"OVER BUDGET {median:.2f} ms > {args.budget:.2f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
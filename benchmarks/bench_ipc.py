@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from webview2 import create_window, start_windows
+
+PAYLOAD_SIZES = (1 << 10, 16 << 10, 256 << 10, 1 << 20, 4 << 20)
+FAN_OUT = (1, 10, 100, 1000)
+
+
+async def echo(value):
+    return value
+
+
+targets = {
+    "call": lambda window, value: window.call("echo", value),
+    "prepared": lambda window, value: window.prepare("echo")(value),
+    "evaluate_js": lambda window, value: window.evaluate_js("return 1"),
+    "api": lambda window, value: asyncio.wrap_future(window.gui.page.api.echo(value)),
+}
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+async def open_window(batch_calls, metrics=False):
+    window = create_window(
+        "bench",
+        "loopback://bench",
+        js_api=[echo],
+        hidden=True,
+        batch_calls=batch_calls,
+        backend="loopback",
+        metrics=metrics,
+    )
+    window.gui.functions["echo"] = lambda value: value
+    window.gui.scripts["return 1"] = lambda: 1
+
+    await start_windows(window, join=False)
+    await window.navigated.wait()
+    return window
+
+
+async def bench_latency(window, target, iterations):
+    samples = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await targets[target](window, "ping")
+        samples.append(time.perf_counter() - start)
+
+    return {
+        f"{target}.latency.p50_us": percentile(samples, 0.5) * 1e6,
+        f"{target}.latency.p99_us": percentile(samples, 0.99) * 1e6,
+    }
+
+
+async def bench_throughput(window, target, duration, concurrency=64):
+    calls = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal calls
+        while time.perf_counter() < deadline:
+            await targets[target](window, "ping")
+            calls += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {f"{target}.calls_per_sec": calls / (time.perf_counter() - start)}
+
+
+async def bench_payload(window, target, iterations):
+    results = {}
+
+    for size in PAYLOAD_SIZES:
+        for kind, payload in (("str", "x" * size), ("bytes", b"x" * size)):
+            samples = []
+
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await targets[target](window, payload)
+                samples.append(time.perf_counter() - start)
+
+            results[f"{target}.payload.{kind}.{size}.ms"] = (
+                statistics.median(samples) * 1e3
+            )
+
+    return results
+
+
+async def bench_fan_out(window, target):
+    results = {}
+
+    for width in FAN_OUT:
+        start = time.perf_counter()
+        await asyncio.gather(*(targets[target](window, "ping") for _ in range(width)))
+        results[f"{target}.fan_out.{width}.ms"] = (time.perf_counter() - start) * 1e3
+
+    return results
+
+
+def higher_is_better(metric):
+    return metric.endswith("calls_per_sec")
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+
+    for metric, value in results.items():
+        if metric not in baseline:
+            continue
+
+        ratio = value / baseline[metric] if baseline[metric] else 1
+        if higher_is_better(metric):
+            ratio = 1 / ratio if ratio else float("inf")
+
+        if ratio > 1 + tolerance:
+            regressions.append((metric, baseline[metric], value))
+
+    return regressions
+
+
+async def run(args):
+    window = await open_window(args.batch, args.metrics)
+    results = {}
+
+    for target in args.targets:
+        results.update(await bench_latency(window, target, args.iterations))
+        results.update(await bench_throughput(window, target, args.duration))
+        if target != "evaluate_js":
+            results.update(await bench_payload(window, target, args.payload_iterations))
+        results.update(await bench_fan_out(window, target))
+
+    window.gui.close()
+    await window.closed.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="IPC benchmarks on the loopback backend"
+    )
+    parser.add_argument("--targets", nargs="+", default=list(targets), choices=targets)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--payload-iterations", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--batch", action="store_true", help="use batch_calls")
+    parser.add_argument("--metrics", action="store_true", help="enable Window metrics")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.quick:
+        args.iterations, args.payload_iterations, args.duration = 100, 1, 0.2
+
+    results = asyncio.run(run(args))
+
+    for metric, value in results.items():
+        print(f"{metric:<40} {value:>14.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+        for metric, before, after in regressions:
+            print(f"REGRESSION {metric}: {before:.2f} -> {after:.2f}")
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import asyncio
+import inspect
+
+import pytest
+
+from webview2 import create_window, start_windows
+from webview2.loopback import LoopbackGui
+
+TEST_TIMEOUT = 10
+
+
+async def run_test(func, kwargs):
+    try:
+        await asyncio.wait_for(func(**kwargs), TEST_TIMEOUT)
+
+    finally:
+        for window in list(LoopbackGui.instances):
+            window.gui.close()
+            await window.closed.wait()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+
+    kwargs = {
+        name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames
+    }
+    asyncio.run(run_test(pyfuncitem.obj, kwargs))
+    return True
+
+
+@pytest.fixture
+def open_window():
+    async def open_window(url="https://app.local/", functions=None, **options):
+        window = create_window("test", url, hidden=True, backend="loopback", **options)
+        window.gui.functions.update(functions or {})
+        await start_windows(window, join=False)
+        await window.navigated.wait()
+        return window
+
+    return open_window
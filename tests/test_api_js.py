@@ -0,0 +1,171 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from webview2.utils import load_js_api
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+
+HARNESS = """
+globalThis.window = globalThis;
+globalThis.dispatchEvent = () => {};
+globalThis.CustomEvent = class {};
+const posted = [];
+let listener = null;
+globalThis.chrome = {
+    webview: {
+        postMessage: (message) => posted.push(message),
+        addEventListener: (type, callback) => (listener = callback),
+    },
+};
+const tick = () => new Promise((resolve) => setTimeout(resolve, 0));
+"""
+
+
+def run_js(body, **options):
+    config = {
+        "protocols": [2, 1],
+        "generation": 0,
+        "timeout": None,
+        "maxPending": None,
+        **options,
+    }
+    script = (
+        f"{HARNESS}\n{load_js_api()}\n"
+        f"webview._init({json.dumps(config)});\n"
+        f"(async () => {{ {body} }})()"
+        ".then((result) => console.log(JSON.stringify({ result, posted })))"
+        ".catch((error) => { console.error(error); process.exit(1); });"
+    )
+    output = subprocess.run(
+        ["node", "-e", script], capture_output=True, text=True, timeout=30
+    )
+    assert output.returncode == 0, output.stderr
+    return json.loads(output.stdout)
+
+
+def test_ready_reports_protocol():
+    assert run_js("webview._ready();")["posted"] == [[5, 2]]
+
+
+def test_api_call_posts_and_resolves():
+    data = run_js("""
+        const result = webview.api.add(1, 2);
+        webview._resultOk(0, 3, false);
+        return await result;
+        """)
+    assert data["posted"] == [[0, 0, "add", [1, 2]]]
+    assert data["result"] == 3
+
+
+def test_api_call_rejected_on_error():
+    data = run_js("""
+        const result = webview.api.fail();
+        webview._resultOk(0, { name: "ValueError", message: "no", stack: "" }, true);
+        try {
+            await result;
+        } catch (error) {
+            return [error.name, error.message];
+        }
+        """)
+    assert data["result"] == ["ValueError", "no"]
+
+
+def test_call_js_posts_result():
+    data = run_js("webview._callJs(7, async () => 6 * 7); await tick();")
+    assert data["posted"] == [[1, 7, False, 42]]
+
+
+def test_chunks_reassemble_in_decode():
+    data = run_js("""
+        listener({ data: "py-0:1:2:" + btoa("world") });
+        listener({ data: "py-0:0:2:" + btoa("hello ") });
+        const bytes = await webview._decode({ $transfer: "py-0", size: 11 });
+        return new TextDecoder().decode(bytes);
+        """)
+    assert data["result"] == "hello world"
+
+
+def test_prepared_call_waits_for_registration():
+    data = run_js("""
+        listener({ data: [3, 0, [20], false] });
+        await tick();
+        webview._prepare(0, (x) => x + 1);
+        await tick();
+        """)
+    assert data["posted"] == [[1, 3, False, 21]]
+
+
+def test_state_patch_applies_ops():
+    data = run_js("""
+        const state = webview.state("app");
+        webview._stateReset("app", 1, { items: [1] }, false);
+        webview._statePatch("app", 2, [{ op: "add", path: "/items/-", value: 2 }]);
+        return state.value;
+        """)
+    assert data["result"] == {"items": [1, 2]}
+
+
+def test_published_values_are_acknowledged():
+    data = run_js("""
+        const seen = [];
+        webview.subscribe("t", (value) => seen.push(value));
+        webview._publish({ t: 1 }, 4);
+        await tick();
+        return seen;
+        """)
+    assert data["result"] == [1]
+    assert data["posted"] == [[7, 4]]
+
+
+def test_batch_compiles_each_entry_separately():
+    data = run_js("""
+        webview._callJsBatch([[1, "return 1 + 1"], [2, "return )"], [3, "return 3"]]);
+        await tick();
+        await tick();
+        """)
+    ((message_type, *fields),) = data["posted"]
+    results = {
+        call_id: (is_error, result)
+        for call_id, is_error, result in zip(fields[0::3], fields[1::3], fields[2::3])
+    }
+
+    assert message_type == 2
+    assert results[1] == (False, 2)
+    assert results[2][0] and results[2][1]["name"] == "SyntaxError"
+    assert results[3] == (False, 3)
+
+
+def test_transfer_threshold_comes_from_config():
+    body = "webview.api.echo(new Uint8Array(100));"
+
+    assert not any(isinstance(message, str) for message in run_js(body)["posted"])
+    assert run_js(body, transferThreshold=16)["posted"][0].startswith("js-0:0:1:")
+
+
+def test_failed_registration_rejects_prepared_calls():
+    data = run_js("""
+        listener({ data: [7, 0, [1], false] });
+        await tick();
+        webview._checkPrepared(0);
+        listener({ data: [8, 0, [2], false] });
+        await tick();
+        await tick();
+        """)
+    assert sorted(message[:3] for message in data["posted"]) == [
+        [1, 7, True],
+        [1, 8, True],
+    ]
+    assert data["posted"][0][3]["name"] == "SyntaxError"
+
+
+def test_registered_functions_pass_the_check():
+    data = run_js("""
+        webview._prepare(0, (x) => x * 2);
+        webview._checkPrepared(0);
+        listener({ data: [7, 0, [4], false] });
+        await tick();
+        """)
+    assert data["posted"] == [[1, 7, False, 8]]
@@ -0,0 +1,165 @@
+import gzip
+import os
+import zipfile
+
+import pytest
+
+from webview2.assets import AssetServer, accept_weights
+
+TEXT = ("console.log('hello');\n" * 200).encode()
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "app.js").write_bytes(TEXT)
+    (tmp_path / "index.html").write_bytes(b"<html></html>")
+    (tmp_path / "data.bin").write_bytes(bytes(range(256)) * 64)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.html").write_bytes(b"docs")
+    return tmp_path
+
+
+def get(server, path, **headers):
+    return server.handle("GET", f"https://app.local/{path}", headers)
+
+
+def test_index_fallback_and_errors(root):
+    server = AssetServer(str(root), fallback="index.html")
+
+    assert get(server, "").body == b"<html></html>"
+    assert get(server, "docs/").body == b"docs"
+    assert get(server, "missing/route").body == b"<html></html>"
+    assert get(server, "../secret").body == b"<html></html>"
+    assert AssetServer(str(root)).handle("GET", "https://app.local/x").status == 404
+    assert server.handle("POST", "https://app.local/app.js").status == 405
+
+
+def test_etag_and_not_modified(root):
+    server = AssetServer(str(root))
+    response = get(server, "data.bin")
+    etag = response.headers["ETag"]
+
+    assert response.status == 200
+    assert get(server, "data.bin", **{"If-None-Match": etag}).status == 304
+    assert get(server, "data.bin", **{"If-None-Match": '"other"'}).status == 200
+
+    os.utime(root / "data.bin", ns=(0, 0))
+    assert get(server, "data.bin", **{"If-None-Match": etag}).status == 200
+
+
+def test_edits_are_picked_up(root):
+    server = AssetServer(str(root))
+    assert get(server, "index.html").body == b"<html></html>"
+
+    (root / "index.html").write_bytes(b"<html>v2</html>")
+    assert get(server, "index.html").body == b"<html>v2</html>"
+
+
+@pytest.mark.parametrize("max_cached_file", [0, 1 << 20])
+def test_ranges(root, max_cached_file):
+    server = AssetServer(str(root), max_cached_file=max_cached_file)
+    data = (root / "data.bin").read_bytes()
+
+    response = get(server, "data.bin", Range="bytes=10-19")
+    assert response.status == 206
+    assert response.body == data[10:20]
+    assert response.headers["Content-Range"] == f"bytes 10-19/{len(data)}"
+
+    assert get(server, "data.bin", Range="bytes=-5").body == data[-5:]
+    assert get(server, "data.bin", Range="bytes=16000-").body == data[16000:]
+    assert get(server, "data.bin", Range=f"bytes={len(data)}-").status == 416
+
+    for header in ("bytes=0-1,5-6", "items=0-1"):
+        response = get(server, "data.bin", Range=header)
+        assert (response.status, response.body) == (200, data)
+
+
+def test_head_has_length_without_body(root):
+    server = AssetServer(str(root), max_cached_file=0)
+    response = server.handle("HEAD", "https://app.local/data.bin")
+
+    assert response.body == b""
+    assert response.headers["Content-Length"] == str(256 * 64)
+
+
+def test_accept_weights():
+    assert accept_weights("gzip;q=0.0, br ;q=0.5, *") == {
+        "gzip": 0.0,
+        "br": 0.5,
+        "*": 1.0,
+    }
+
+
+@pytest.mark.parametrize(
+    "header, encoding",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("gzip;q=0.0", None),
+        ("gzip; q=0.000", None),
+        ("*", "gzip"),
+        ("*, gzip;q=0", None),
+        ("identity", None),
+    ],
+)
+def test_encoding_negotiation(root, header, encoding):
+    server = AssetServer(str(root))
+    response = get(server, "app.js", **{"Accept-Encoding": header})
+
+    assert response.headers.get("Content-Encoding") == encoding
+    body = gzip.decompress(response.body) if encoding else response.body
+    assert body == TEXT
+
+
+def test_precompressed_sibling_and_ranges_skip_encoding(root):
+    (root / "app.js.gz").write_bytes(gzip.compress(b"sibling"))
+    server = AssetServer(str(root))
+
+    response = get(server, "app.js", **{"Accept-Encoding": "gzip"})
+    assert gzip.decompress(response.body) == b"sibling"
+    assert response.headers["ETag"] != get(server, "app.js").headers["ETag"]
+
+    response = get(server, "app.js", Range="bytes=0-6", **{"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.body == TEXT[:7]
+
+
+def test_cache_counts_compressed_variants(root):
+    server = AssetServer(str(root))
+    get(server, "app.js", **{"Accept-Encoding": "gzip"})
+
+    compressed = len(gzip.compress(TEXT, mtime=0))
+    assert server.stats()["cached_bytes"] == len(TEXT) + compressed
+
+    server = AssetServer(str(root), cache_bytes=len(TEXT) + compressed)
+    get(server, "index.html")
+    get(server, "app.js", **{"Accept-Encoding": "gzip"})
+    assert server.stats()["assets"] == 1
+    assert server.stats()["cached_bytes"] == len(TEXT) + compressed
+
+
+def test_large_files_are_not_cached(root):
+    server = AssetServer(str(root), max_cached_file=1024)
+    get(server, "data.bin")
+
+    assert server.stats()["cached_bytes"] == 0
+
+
+def test_zip_source(tmp_path):
+    archive = tmp_path / "app.zip"
+    with zipfile.ZipFile(archive, "w") as zip:
+        zip.writestr("index.html", "<html>zip</html>")
+        zip.writestr("app.js", TEXT)
+
+    server = AssetServer(str(archive))
+
+    assert get(server, "").body == b"<html>zip</html>"
+    assert get(server, "app.js", Range="bytes=0-6").body == TEXT[:7]
+
+
+async def test_loopback_fetch(open_window, root):
+    window = await open_window()
+    window.serve_assets(str(root))
+
+    response = window.gui.invoke(lambda: window.gui.page.fetch("https://app.local/"))
+    assert response.body == b"<html></html>"
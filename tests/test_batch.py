@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from webview2.error import JSError
+
+
+def fail():
+    raise ValueError("no")
+
+
+@pytest.mark.parametrize("protocol", [1, 2])
+async def test_calls_in_one_tick_share_a_batch(open_window, protocol):
+    window = await open_window(
+        functions={"add": lambda a, b: a + b, "fail": fail},
+        batch_calls=True,
+        protocol=protocol,
+    )
+    window.gui.scripts["return document.title"] = lambda: "title"
+    batches = []
+    call_js = window.ipc.call_js
+
+    def record(calls, callback=None):
+        batches.append([call_id for call_id, _ in calls])
+        return call_js(calls, callback)
+
+    window.ipc.call_js = record
+
+    results = await asyncio.gather(
+        window.call("add", 1, 2),
+        window.call("fail"),
+        window.evaluate_js("return document.title"),
+        window.evaluate_js("return )"),
+        window.call("add", 3, 4),
+        return_exceptions=True,
+    )
+
+    assert len(batches) == 1 and len(batches[0]) == 5
+    assert results[0] == 3
+    assert isinstance(results[1], JSError) and results[1].name == "ValueError"
+    assert results[2] == "title"
+    assert isinstance(results[3], JSError)
+    assert results[4] == 7
+
+    assert await window.call("add", 5, 6) == 11
+    assert len(batches) == 2
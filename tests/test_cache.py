@@ -0,0 +1,77 @@
+import asyncio
+
+from webview2.cache import ResultCache, cached
+
+
+def counter():
+    calls = []
+
+    async def func(value=None):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    return func, calls
+
+
+async def test_hits_misses_and_coalescing():
+    cache = ResultCache()
+    func, calls = counter()
+
+    results = await asyncio.gather(*(cache.call((1,), func) for _ in range(3)))
+    assert results == [1, 1, 1]
+    assert await cache.call([1], func) == 1
+    assert await cache.call((2,), func) == 2
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["coalesced"]) == (1, 2, 2)
+
+
+async def test_maxsize_and_ttl():
+    cache = ResultCache(maxsize=1, ttl=0.02)
+    func, calls = counter()
+
+    await cache.call((1,), func)
+    await cache.call((2,), func)
+    assert cache.stats()["evictions"] == 1
+
+    await asyncio.sleep(0.03)
+    assert await cache.call((2,), func) == 3
+
+
+async def test_invalidate_drops_in_flight_results():
+    cache = ResultCache()
+    source = {"value": 1}
+
+    async def read():
+        value = source["value"]
+        await asyncio.sleep(0.01)
+        return value
+
+    stale = asyncio.ensure_future(cache.call((), read))
+    await asyncio.sleep(0.005)
+    source["value"] = 2
+    cache.invalidate()
+
+    assert await cache.call((), read) == 2
+    assert await stale == 1
+    assert await cache.call((), read) == 2
+
+
+async def test_window_cache_invalidation(open_window):
+    source = {"value": 1}
+
+    @cached()
+    async def config(section):
+        return [section, source["value"]]
+
+    window = await open_window(js_api=[config])
+    api = window.gui.page.api
+
+    assert await asyncio.wrap_future(api.config("ui")) == ["ui", 1]
+    source["value"] = 2
+    assert await asyncio.wrap_future(api.config("ui")) == ["ui", 1]
+
+    window.invalidate_cache("config", "ui")
+    assert await asyncio.wrap_future(api.config("ui")) == ["ui", 2]
+    assert window.cache_stats()["config"]["hits"] == 1
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from webview2.error import CallCancelledError, TooManyCallsError
+
+
+async def test_call_timeout_cleans_up(open_window):
+    release = threading.Event()
+    window = await open_window(functions={"block": release.wait}, call_timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await window.call("block")
+
+    assert window._future_map == {}
+    release.set()
+
+
+async def test_pending_call_cap(open_window):
+    release = threading.Event()
+    window = await open_window(functions={"block": release.wait}, max_pending_calls=2)
+    calls = [asyncio.ensure_future(window.call("block")) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(TooManyCallsError):
+        await window.call("block")
+
+    release.set()
+    assert await asyncio.gather(*calls) == [True, True]
+
+
+@pytest.mark.parametrize("reason", ["navigation", "closed"])
+async def test_reset_fails_in_flight_calls(open_window, reason):
+    release = threading.Event()
+    window = await open_window(functions={"block": release.wait})
+    call = asyncio.ensure_future(window.call("block"))
+    await asyncio.sleep(0.05)
+
+    window.ipc.handle_reset(reason)
+
+    with pytest.raises(CallCancelledError):
+        await call
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert window._future_map == {}
+
+
+async def test_calls_before_bridge_are_queued(open_window):
+    window = await open_window(functions={"add": lambda a, b: a + b})
+    window.ipc.handle_reset("navigation")
+    await asyncio.sleep(0)
+    call = asyncio.ensure_future(window.call("add", 1, 2))
+    await asyncio.sleep(0.05)
+
+    assert not call.done()
+    window.gui.invoke(lambda: window.ipc.initialize())
+    assert await call == 3
+
+
+async def test_failed_navigation_keeps_the_bridge(open_window):
+    window = await open_window(functions={"add": lambda a, b: a + b})
+
+    def fail(url):
+        raise ValueError(url)
+
+    window.gui.navigate = fail
+
+    with pytest.raises(ValueError):
+        window.url = "bad"
+
+    assert await asyncio.wait_for(window.call("add", 1, 2), 1) == 3
+
+
+@pytest.mark.parametrize("protocol", [1, 2])
+async def test_replies_do_not_count_as_pending_calls(open_window, protocol):
+    held = Future()
+
+    async def echo(value):
+        return value
+
+    window = await open_window(
+        js_api=[echo],
+        functions={"hold": lambda: held},
+        protocol=protocol,
+        max_pending_calls=1,
+    )
+    outgoing = asyncio.create_task(window.call("hold"))
+    await asyncio.sleep(0.01)
+    assert len(window._future_map) == 1
+
+    assert await asyncio.wrap_future(window.gui.page.api.echo(1)) == 1
+
+    held.set_result(5)
+    assert await outgoing == 5
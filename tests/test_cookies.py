@@ -0,0 +1,84 @@
+from http.cookiejar import MozillaCookieJar
+
+import pytest
+
+from webview2.cookies import (
+    cookie,
+    from_cookiejar,
+    load_netscape,
+    matches,
+    normalize,
+    save_netscape,
+    to_cookiejar,
+)
+
+SESSION = cookie("session", "abc", ".app.local", "/", None, True, True)
+THEME = cookie("theme", "dark", "app.local", "/docs", 2000000000)
+
+
+def test_normalize_accepts_tuples_dicts_and_jars():
+    assert normalize([("a", "1"), SESSION]) == [cookie("a", "1"), SESSION]
+    assert normalize(to_cookiejar([SESSION, THEME])) == [SESSION, THEME]
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (None, {"session", "theme"}),
+        ("https://app.local/", {"session"}),
+        ("https://app.local/docs/page", {"session", "theme"}),
+        ("http://app.local/docs", {"theme"}),
+        ("https://sub.app.local/docs", {"session"}),
+        ("https://other.local/docs", set()),
+        ("https://app.local/docsets", {"session"}),
+    ],
+)
+def test_matches(url, expected):
+    assert {item["name"] for item in (SESSION, THEME) if matches(item, url)} == expected
+
+
+def test_cookiejar_round_trip_keeps_attributes():
+    jar = to_cookiejar([SESSION, THEME])
+    items = {item.name: item for item in jar}
+
+    assert items["session"].secure and items["session"].discard
+    assert items["session"].domain_initial_dot
+    assert items["theme"].expires == 2000000000
+    assert from_cookiejar(jar) == [SESSION, THEME]
+
+
+def test_netscape_file_round_trip(tmp_path):
+    filename = str(tmp_path / "cookies.txt")
+    save_netscape([SESSION, THEME], filename)
+
+    MozillaCookieJar(filename).load(ignore_discard=True)
+    loaded = {item["name"]: item for item in load_netscape(filename)}
+
+    assert loaded["theme"] == THEME
+    assert loaded["session"]["value"] == "abc"
+    assert loaded["session"]["secure"]
+
+
+async def test_window_cookie_methods(open_window, tmp_path):
+    window = await open_window()
+    filename = str(tmp_path / "cookies.txt")
+
+    window.add_cookie("plain", "1", "app.local")
+    await window.add_cookies([SESSION, ("theme", "dark", "app.local", "/docs")])
+
+    names = lambda cookies: sorted(item["name"] for item in cookies)
+    assert names(await window.get_cookies()) == ["plain", "session", "theme"]
+    assert names(await window.get_cookies("https://app.local/")) == [
+        "plain",
+        "session",
+    ]
+
+    await window.save_cookies(filename)
+    await window.delete_cookies([SESSION])
+    assert names(await window.get_cookies()) == ["plain", "theme"]
+
+    await window.delete_cookies()
+    assert await window.get_cookies() == []
+
+    await window.load_cookies(filename)
+    assert names(await window.get_cookies()) == ["plain", "session", "theme"]
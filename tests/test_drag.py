@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import time
+
+from webview2 import DragMover
+
+
+def timer_threads():
+    return sum(thread.name == "drag-timer" for thread in threading.enumerate())
+
+
+def drive(mover, count, period):
+    for x in range(1, count + 1):
+        mover.feed(x, 2 * x)
+        time.sleep(period)
+
+
+async def test_moves_are_coalesced_on_one_timer_thread(open_window):
+    window = await open_window()
+    mover = DragMover(window, interval=1 / 60)
+
+    await asyncio.to_thread(drive, mover, 200, 0.001)
+    assert timer_threads() == 1
+
+    await asyncio.sleep(0.1)
+    assert window.gui.position == (200, 400)
+    assert mover.stats()["updates"] < mover.stats()["events"] / 4
+
+    mover._stop_timer()
+    await asyncio.sleep(0.05)
+    assert timer_threads() == 0
+
+
+async def test_direct_moves_without_interval(open_window):
+    window = await open_window()
+    mover = DragMover(window, interval=None)
+
+    for x in range(1, 4):
+        mover.feed(x, x)
+
+    assert window.gui.position == (3, 3)
+    assert mover.stats()["updates"] == 3
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+from webview2.events import BLOCK, COALESCE, EventStream
+
+
+async def drain(subscription):
+    items = []
+
+    while subscription.stats()["buffered"]:
+        items.append(await subscription.__anext__())
+
+    return items
+
+
+async def test_breaking_out_of_async_for_unsubscribes():
+    stream = EventStream()
+
+    for _ in range(3):
+        stream.set(1)
+        async for args in stream:
+            break
+
+    await asyncio.sleep(0.01)
+    assert stream.subscribers == []
+
+    for i in range(100):
+        stream.set(i)
+
+    await asyncio.sleep(0)
+    assert stream.dropped == 0
+
+
+async def test_subscription_context_closes():
+    stream = EventStream()
+
+    async with stream.subscribe() as subscription:
+        stream.set("a")
+        assert await subscription.__anext__() == ("a",)
+
+    assert stream.subscribers == []
+
+
+async def test_drop_oldest_and_coalesce():
+    stream = EventStream(buffer=2)
+    oldest = stream.subscribe()
+    newest = stream.subscribe(overflow=COALESCE)
+
+    for i in range(4):
+        stream.set(i)
+
+    await asyncio.sleep(0)
+    assert await drain(oldest) == [(2,), (3,)]
+    assert await drain(newest) == [(0,), (3,)]
+    assert stream.dropped == 4
+
+
+async def test_block_from_loop_thread_stays_bounded():
+    stream = EventStream(buffer=3, overflow=BLOCK)
+    subscription = stream.subscribe()
+
+    for i in range(10):
+        stream.set(i)
+
+    await asyncio.sleep(0)
+    assert await drain(subscription) == [(7,), (8,), (9,)]
+    assert subscription.dropped == 7
+
+
+async def test_block_makes_other_threads_wait():
+    stream = EventStream(buffer=2, overflow=BLOCK)
+    subscription = stream.subscribe()
+    sent = []
+
+    def produce():
+        for i in range(5):
+            stream.set(i)
+            sent.append(i)
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    await asyncio.sleep(0.05)
+    assert len(sent) == 2
+
+    received = [await subscription.__anext__() for _ in range(5)]
+    await asyncio.to_thread(thread.join)
+
+    assert received == [(i,) for i in range(5)]
+    assert subscription.dropped == 0
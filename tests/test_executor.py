@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import pytest
+
+from webview2.executor import INLINE, THREAD, Handler, run_in
+
+
+def thread_name():
+    return threading.current_thread().name
+
+
+async def test_policies_pick_where_handlers_run():
+    assert await Handler(thread_name)() != threading.current_thread().name
+    assert await Handler(thread_name, INLINE)() == threading.current_thread().name
+    assert Handler(run_in(INLINE)(thread_name)).policy == INLINE
+
+
+def test_async_handlers_must_run_inline():
+    async def handler():
+        pass
+
+    with pytest.raises(ValueError):
+        Handler(handler, THREAD)
+
+    with pytest.raises(ValueError):
+        Handler(thread_name, "gpu")
+
+
+async def test_max_concurrency_limits_calls():
+    active = peak = 0
+
+    async def work():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    handler = Handler(work, max_concurrency=2)
+    await asyncio.gather(*(handler() for _ in range(6)))
+
+    assert peak == 2
+
+
+async def test_max_concurrency_limits_open_streams():
+    active = peak = 0
+
+    async def numbers():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            for i in range(3):
+                await asyncio.sleep(0.01)
+                yield i
+        finally:
+            active -= 1
+
+    async def consume(handler):
+        return [item async for item in handler.stream(())]
+
+    handler = Handler(numbers, max_concurrency=1)
+    results = await asyncio.gather(*(consume(handler) for _ in range(3)))
+
+    assert results == [[0, 1, 2]] * 3
+    assert peak == 1
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from webview2.backend import Gui
+from webview2.error import JSError
+from webview2.loopback import LoopbackGui
+
+
+async def echo(value):
+    return value
+
+
+def fail():
+    raise ValueError("no")
+
+
+async def test_call_round_trip(open_window):
+    window = await open_window(functions={"add": lambda a, b: a + b})
+
+    assert await window.call("add", 1, 2) == 3
+    assert await asyncio.gather(*(window.call("add", i, i) for i in range(5))) == [
+        0,
+        2,
+        4,
+        6,
+        8,
+    ]
+
+
+async def test_call_error(open_window):
+    window = await open_window(functions={"fail": fail})
+
+    with pytest.raises(JSError) as info:
+        await window.call("fail")
+
+    assert info.value.name == "ValueError"
+
+
+async def test_evaluate_js_registered_script(open_window):
+    window = await open_window()
+    window.gui.scripts["return document.title"] = lambda: "title"
+
+    assert await window.evaluate_js("return document.title") == "title"
+
+
+async def test_page_calls_python(open_window):
+    window = await open_window(js_api=[echo, fail])
+
+    assert await asyncio.wrap_future(window.gui.page.api.echo({"a": [1]})) == {"a": [1]}
+
+    with pytest.raises(JSError):
+        await asyncio.wrap_future(window.gui.page.api.fail())
+
+
+@pytest.mark.parametrize("protocol", [1, 2])
+async def test_binary_round_trip(open_window, protocol):
+    window = await open_window(
+        js_api=[echo], functions={"size": len}, protocol=protocol
+    )
+    data = bytes(range(256)) * 1024
+
+    assert await window.call("size", data) == len(data)
+    assert await asyncio.wrap_future(window.gui.page.api.echo(data)) == data
+
+
+async def test_notify_accepts_plain_and_spread_arguments(open_window):
+    seen = []
+    window = await open_window(functions={"record": lambda *args: seen.append(args)})
+
+    window.notify("record", 1, "two")
+    await window.call("record", 3)
+    window.gui.invoke(lambda: window.gui.page.run('record({"a": 1}, [2])'))
+
+    assert seen == [(1, "two"), (3,), ({"a": 1}, [2])]
+
+
+def test_backend_interface_is_abstract():
+    class Incomplete(Gui.IPCHandler):
+        def initialize(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete(None)
+
+    LoopbackGui.IPCHandler(None)
+
+
+async def test_navigation_errors_reach_the_caller(open_window):
+    window = await open_window()
+
+    def fail(url):
+        raise ValueError(f"invalid URI {url}")
+
+    window.gui.navigate = fail
+
+    with pytest.raises(ValueError):
+        window.url = "bad"
+
+    with pytest.raises(ValueError):
+        await window.navigate("bad")
+
+
+async def test_navigate_loads_a_new_page(open_window):
+    window = await open_window(functions={"add": lambda a, b: a + b})
+    page = window.gui.page
+
+    await window.fetch_url("https://app.local/next")
+
+    assert window.gui.url == "https://app.local/next"
+    assert window.gui.page is not page
+    assert await window.call("add", 1, 2) == 3
+
+
+async def test_cancelled_page_calls_do_not_break_close(open_window, capsys):
+    release = asyncio.Event()
+
+    async def wait():
+        await release.wait()
+
+    window = await open_window(js_api=[wait], call_timeout=0.05)
+    expiring = window.gui.page.api.wait()
+    expiring.cancel()
+    await asyncio.sleep(0.1)
+
+    closing = window.gui.page.api.wait()
+    await asyncio.sleep(0.01)
+    closing.cancel()
+    window.gui.close()
+    await window.closed.wait()
+    release.set()
+
+    assert "InvalidStateError" not in capsys.readouterr().err
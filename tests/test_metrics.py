@@ -0,0 +1,70 @@
+import asyncio
+import json
+import threading
+
+from webview2.metrics import Histogram, Metrics
+
+
+def test_histogram_quantiles():
+    histogram = Histogram((1, 10, 100))
+
+    for value in (0.5, 5, 5, 50, 500):
+        histogram.record(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["max"] == 500
+    assert snapshot["p50"] == 10
+    assert snapshot["p99"] == 500
+    assert snapshot["buckets"] == {1: 1, 10: 2, 100: 1, "inf": 1}
+
+
+def test_observe_and_snapshot_from_several_threads():
+    metrics = Metrics()
+
+    def observe(thread):
+        for i in range(2000):
+            metrics.observe(f"h{thread}.{i % 50}", i)
+            metrics.count("observed")
+
+    threads = [threading.Thread(target=observe, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+
+    while any(thread.is_alive() for thread in threads):
+        metrics.snapshot()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["observed"] == 8000
+    assert sum(h["count"] for h in snapshot["histograms"].values()) == 8000
+
+
+async def echo(value):
+    return value
+
+
+async def test_window_stats_report_metrics(open_window):
+    window = await open_window(
+        js_api=[echo], functions={"add": lambda a, b: a + b}, metrics=True
+    )
+
+    for i in range(3):
+        assert await window.call("add", i, 1) == i + 1
+        assert await asyncio.wrap_future(window.gui.page.api.echo("x" * 100)) == (
+            "x" * 100
+        )
+
+    stats = window.stats()
+    histograms = stats["histograms"]
+
+    assert histograms["js.call.ms"]["count"] == 3
+    assert histograms["api.echo.ms"]["count"] == 3
+    assert histograms["scheduler.wait.ms"]["count"] == 3
+    assert (
+        histograms["loop.lag.ms"]["count"] == histograms["ipc.received.bytes"]["count"]
+    )
+    assert histograms["ipc.received.bytes"]["max"] >= 100
+    assert histograms["dispatcher.queue.ms"]["count"] > 0
+    assert histograms["ipc.sent.bytes"]["count"] >= 6
+    assert stats["gauges"]["pending_calls"] == 0
+    json.dumps(stats)
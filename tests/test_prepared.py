@@ -0,0 +1,29 @@
+import pytest
+
+from webview2.error import JSError
+
+
+async def test_prepared_function_round_trip(open_window):
+    window = await open_window(functions={"double": lambda x: x * 2})
+    double = window.prepare("double")
+
+    assert window.prepare("double") is double
+    assert [await double(i) for i in range(3)] == [0, 2, 4]
+
+    await window.fetch_url("https://app.local/next")
+    assert await double(5) == 10
+
+    double.release()
+    with pytest.raises(ValueError):
+        await double(1)
+
+
+async def test_bad_source_fails_calls_instead_of_hanging(open_window):
+    window = await open_window()
+    broken = window.prepare("(x) => ")
+
+    for _ in range(2):
+        with pytest.raises(JSError) as info:
+            await broken(1)
+
+        assert info.value.name == "SyntaxError"
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from webview2.protocol import (
+    CALL,
+    RESULT,
+    RESULTS,
+    STREAM,
+    ProtocolV1,
+    ProtocolV2,
+    decode,
+)
+
+
+def test_v2_messages_are_flat():
+    assert decode([CALL, 3, "echo", [1]]) == (CALL, [3, "echo", [1]])
+    assert decode([RESULT, 3, False, {"a": 1}]) == (RESULT, [(3, {"a": 1}, False)])
+    assert decode([RESULTS, 1, False, "a", 2, True, "b"]) == (
+        RESULT,
+        [(1, "a", False), (2, "b", True)],
+    )
+    assert decode([STREAM, 4, "credit", 8]) == (STREAM, [4, "credit", 8])
+
+
+def test_v1_messages_wrap_fields_and_json_results():
+    assert decode([CALL, ["id", "echo", [1]]]) == (CALL, ["id", "echo", [1]])
+    assert decode([RESULT, ["id", json.dumps([1]), False]]) == (
+        RESULT,
+        [("id", [1], False)],
+    )
+    assert decode([RESULTS, [["a", "null", False], ["b", None, True]]]) == (
+        RESULT,
+        [("a", None, False), ("b", None, True)],
+    )
+
+
+def test_call_ids():
+    v2 = ProtocolV2()
+
+    assert [v2.next_id() for _ in range(3)] == [0, 1, 2]
+    assert ProtocolV1().next_id() != ProtocolV1().next_id()
+
+
+def test_script_args():
+    assert ProtocolV2().script_args([1, "a"]) == '[1, "a"]'
+    assert ProtocolV1().script_args([1]) == "JSON.parse('[1]')"
+
+
+@pytest.mark.parametrize("protocol", [1, 2])
+async def test_protocol_negotiation(open_window, protocol):
+    window = await open_window(functions={"add": lambda a, b: a + b}, protocol=protocol)
+
+    assert await window.call("add", 1, 2) == 3
+    assert window.protocol == protocol
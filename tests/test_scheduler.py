@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+from webview2.error import JSError
+from webview2.scheduler import BACKGROUND, INTERACTIVE, NORMAL, CallScheduler
+
+
+def recorder(order, gate, name):
+    async def job():
+        order.append(name)
+        await gate.wait()
+
+    return job
+
+
+async def test_queued_jobs_start_in_priority_order():
+    scheduler = CallScheduler(max_concurrency=1)
+    gate = asyncio.Event()
+    order = []
+
+    for level, name in [
+        (NORMAL, "first"),
+        (BACKGROUND, "background"),
+        (NORMAL, "normal"),
+        (INTERACTIVE, "interactive"),
+    ]:
+        assert scheduler.submit(level, recorder(order, gate, name))
+
+    gate.set()
+    while scheduler.running or scheduler.queued:
+        await asyncio.sleep(0)
+
+    assert order == ["first", "interactive", "normal", "background"]
+    assert scheduler.stats()["completed"] == 4
+    assert scheduler.stats()["max_queued"] == 3
+
+
+async def test_full_queue_rejects():
+    scheduler = CallScheduler(max_concurrency=1, max_queue=1)
+    gate = asyncio.Event()
+    order = []
+
+    assert scheduler.submit(NORMAL, recorder(order, gate, "a"))
+    assert scheduler.submit(NORMAL, recorder(order, gate, "b"))
+    assert not scheduler.submit(NORMAL, recorder(order, gate, "c"))
+
+    scheduler.clear()
+    gate.set()
+    await asyncio.gather(*scheduler.tasks)
+
+    assert order == ["a"]
+    assert scheduler.stats() | {"mean_wait_ms": 0} == {
+        "running": 0,
+        "queued": 0,
+        "max_queued": 1,
+        "submitted": 3,
+        "rejected": 1,
+        "cancelled": 1,
+        "completed": 1,
+        "mean_wait_ms": 0,
+    }
+
+
+async def test_parent_slots_go_to_the_highest_priority_child():
+    parent = CallScheduler(max_concurrency=1)
+    first = CallScheduler(parent=parent)
+    second = CallScheduler(parent=parent)
+    gate = asyncio.Event()
+    order = []
+
+    first.submit(NORMAL, recorder(order, gate, "running"))
+    first.submit(BACKGROUND, recorder(order, gate, "background"))
+    second.submit(INTERACTIVE, recorder(order, gate, "interactive"))
+
+    assert parent.running == 1
+    assert parent.queued == 2
+
+    gate.set()
+    while parent.running or parent.queued:
+        await asyncio.sleep(0)
+
+    assert order == ["running", "interactive", "background"]
+    assert parent.stats()["submitted"] == 3
+
+
+async def test_parent_queue_limit_applies_to_children():
+    parent = CallScheduler(max_concurrency=1, max_queue=0)
+    child = CallScheduler(parent=parent)
+    gate = asyncio.Event()
+
+    assert child.submit(NORMAL, recorder([], gate, "a"))
+    assert not child.submit(NORMAL, recorder([], gate, "b"))
+    assert parent.rejected == child.rejected == 1
+
+    gate.set()
+
+
+gates = {}
+
+
+async def blocker():
+    await gates["blocker"].wait()
+
+
+async def echo(value):
+    return value
+
+
+async def numbers(count):
+    for i in range(count):
+        yield i
+
+
+async def call_page(window, name, *args):
+    return await asyncio.wrap_future(getattr(window.gui.page.api, name)(*args))
+
+
+async def test_rejected_calls_release_their_transfers(open_window):
+    gates["blocker"] = asyncio.Event()
+    window = await open_window(
+        js_api=[blocker, echo], max_concurrent_calls=1, max_queued_calls=0
+    )
+    running = window.gui.page.api.blocker()
+
+    for _ in range(3):
+        with pytest.raises(JSError) as info:
+            await call_page(window, "echo", b"x" * 200_000)
+
+        assert info.value.name == "OverloadedError"
+
+    assert window._transfer._complete == {}
+    assert window._transfer._incoming == {}
+    assert window.stats()["scheduler"]["window"]["rejected"] == 3
+
+    gates["blocker"].set()
+    await asyncio.wrap_future(running)
+    assert await call_page(window, "echo", b"y" * 200_000) == b"y" * 200_000
+
+
+async def test_streams_hold_a_call_slot(open_window):
+    window = await open_window(
+        js_api=[numbers, echo], max_concurrent_calls=1, max_queued_calls=0
+    )
+    stream = await call_page(window, "numbers", 40)
+
+    with pytest.raises(JSError) as info:
+        await call_page(window, "numbers", 1)
+
+    assert info.value.name == "OverloadedError"
+
+    assert await asyncio.to_thread(list, stream) == list(range(40))
+    assert await call_page(window, "echo", 1) == 1
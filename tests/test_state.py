@@ -0,0 +1,136 @@
+import asyncio
+import json
+
+import pytest
+
+from webview2.state import StateDict
+
+
+class Recorder:
+    def __init__(self):
+        self.ops = []
+
+    def record(self, op):
+        self.ops.append(json.loads(op))
+
+
+@pytest.fixture
+def recorded():
+    recorder = Recorder()
+    data = StateDict(recorder, None, None, {"items": [{"n": 0}, {"n": 1}], "a": {}})
+    return data, recorder.ops
+
+
+def test_dict_ops(recorded):
+    data, ops = recorded
+
+    data["a"]["x"] = 1
+    data["a"]["x"] = 2
+    del data["a"]["x"]
+    data["a"] |= {"y": [1]}
+    data["a"]["y"].append(2)
+
+    assert ops == [
+        {"op": "add", "path": "/a/x", "value": 1},
+        {"op": "replace", "path": "/a/x", "value": 2},
+        {"op": "remove", "path": "/a/x"},
+        {"op": "add", "path": "/a/y", "value": [1]},
+        {"op": "add", "path": "/a/y/-", "value": 2},
+    ]
+    assert data["a"] == {"y": [1, 2]}
+
+
+def test_list_children_follow_their_index(recorded):
+    data, ops = recorded
+    items = data["items"]
+    second = items[1]
+
+    items.insert(0, {"n": -1})
+    second["n"] = 10
+    items.pop(0)
+    second["n"] = 11
+    items.reverse()
+    second["n"] = 12
+
+    assert [op["path"] for op in ops] == [
+        "/items/0",
+        "/items/2/n",
+        "/items/0",
+        "/items/1/n",
+        "/items",
+        "/items/0/n",
+    ]
+
+
+def test_in_place_operators_record_and_wrap(recorded):
+    data, ops = recorded
+    items = data["items"]
+
+    items *= 2
+    items[3]["n"] = 5
+    items += [{"n": 6}]
+    items[4]["n"] = 7
+
+    assert ops[0] == {
+        "op": "replace",
+        "path": "/items",
+        "value": [{"n": 0}, {"n": 1}] * 2,
+    }
+    assert ops[1:] == [
+        {"op": "replace", "path": "/items/3/n", "value": 5},
+        {"op": "add", "path": "/items/-", "value": {"n": 6}},
+        {"op": "replace", "path": "/items/4/n", "value": 7},
+    ]
+    assert items[1] is not items[3]
+
+
+def test_removed_children_stop_recording(recorded):
+    data, ops = recorded
+    removed = data["items"].pop(0)
+    replaced = data["a"]
+    data["a"] = {"b": 1}
+
+    removed["n"] = 1
+    replaced["x"] = 1
+
+    assert [op["path"] for op in ops] == ["/items/0", "/a"]
+
+
+def ping():
+    return None
+
+
+async def settle(window):
+    await asyncio.sleep(0)
+    await window.call("ping")
+
+
+async def test_state_syncs_to_page(open_window):
+    window = await open_window(functions={"ping": ping})
+    state = window.state("app", {"items": [1]})
+    page = window.gui.page
+
+    state["items"].append(2)
+    state["items"] *= 2
+    state["count"] = 1
+    await settle(window)
+
+    assert page.states["app"]["value"] == {"items": [1, 2, 1, 2], "count": 1}
+    assert page.states["app"]["version"] == state.version
+
+
+async def test_two_way_edits_reach_python(open_window):
+    window = await open_window(functions={"ping": ping})
+    state = window.state("app", {"items": []}, two_way=True)
+    changes = state.changed.subscribe()
+    await settle(window)
+
+    ops = [{"op": "add", "path": "/items/-", "value": "x"}]
+    window.gui.invoke(lambda: window.gui.page.edit_state("app", ops))
+
+    assert await changes.__anext__() == (window, ops)
+    assert state["items"] == ["x"]
+
+    state["items"].append("y")
+    await settle(window)
+    assert window.gui.page.states["app"]["value"] == {"items": ["x", "y"]}
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from webview2.error import JSError
+
+produced = []
+
+
+async def numbers(count):
+    for i in range(count):
+        produced.append(i)
+        yield i
+
+
+async def broken():
+    yield 1
+    raise ValueError("broken")
+
+
+async def open_stream(window, name, *args):
+    return await asyncio.wrap_future(getattr(window.gui.page.api, name)(*args))
+
+
+async def test_concurrent_streams_ignore_pending_call_cap(open_window):
+    window = await open_window(js_api=[numbers], max_pending_calls=1)
+    first = await open_stream(window, "numbers", 40)
+    second = await open_stream(window, "numbers", 40)
+
+    assert (
+        await asyncio.gather(
+            asyncio.to_thread(list, first), asyncio.to_thread(list, second)
+        )
+        == [list(range(40))] * 2
+    )
+    assert window._future_map == {}
+    assert window._streams == {}
+
+
+async def test_stream_error_reaches_the_page(open_window):
+    window = await open_window(js_api=[broken])
+
+    with pytest.raises(JSError) as info:
+        await asyncio.to_thread(list, await open_stream(window, "broken"))
+
+    assert info.value.name == "ValueError"
+
+
+async def test_credit_window_limits_unconsumed_items(open_window):
+    window = await open_window(js_api=[numbers])
+    produced.clear()
+
+    stream = await open_stream(window, "numbers", 1000)
+    await asyncio.sleep(0.1)
+
+    assert 16 <= len(produced) <= 17
+    assert await asyncio.to_thread(list, stream) == list(range(1000))
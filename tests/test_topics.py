@@ -0,0 +1,99 @@
+import asyncio
+
+from webview2 import broadcast
+from webview2.protocol import PUBLISHED
+
+
+def hold_acks(window):
+    page = window.gui.page
+    batches = []
+
+    def publish(values, batch):
+        page.topics.update(values)
+        batches.append((batch, values))
+
+    page.bridge["webview._publish"] = publish
+    return batches
+
+
+def ack(window, batch):
+    window.gui.invoke(lambda: window.gui.page.post(PUBLISHED, batch))
+
+
+async def until(predicate):
+    while not predicate():
+        await asyncio.sleep(0.001)
+
+
+async def test_values_coalesce_while_a_batch_is_in_flight(open_window):
+    window = await open_window()
+    batches = hold_acks(window)
+
+    window.publish("a", 1)
+    await until(lambda: batches)
+    window.publish("a", 2)
+    window.publish("b", 1)
+    window.publish("a", 3)
+    await asyncio.sleep(0.01)
+    assert batches == [(0, {"a": 1})]
+
+    ack(window, 99)
+    await asyncio.sleep(0.01)
+    assert len(batches) == 1
+
+    ack(window, 0)
+    await until(lambda: len(batches) == 2)
+    assert batches[1] == (1, {"a": 3, "b": 1})
+
+
+async def test_late_ack_from_previous_page_is_ignored(open_window):
+    window = await open_window()
+    batches = hold_acks(window)
+    window.publish("a", 1)
+    await until(lambda: batches)
+
+    await window.fetch_url("https://app.local/next")
+    batches = hold_acks(window)
+    window.publish("a", 2)
+    await until(lambda: batches)
+    window.publish("a", 3)
+
+    ack(window, 0)
+    await asyncio.sleep(0.01)
+    assert batches == [(1, {"a": 2})]
+
+    ack(window, 1)
+    await until(lambda: len(batches) == 2)
+    assert batches[1] == (2, {"a": 3})
+
+
+async def test_failed_publish_script_does_not_stall_topics(open_window):
+    window = await open_window()
+    page = window.gui.page
+
+    def fail(values, batch):
+        raise RuntimeError("page busy")
+
+    page.bridge["webview._publish"] = fail
+    window.publish("a", 1)
+    await until(lambda: window._publishing is None)
+
+    batches = hold_acks(window)
+    window.publish("a", 2)
+    await until(lambda: batches)
+    assert batches == [(1, {"a": 2})]
+
+
+async def test_broadcast_reaches_every_window(open_window):
+    windows = [await open_window(), await open_window()]
+    seen = []
+    windows[0].gui.invoke(
+        lambda: windows[0].gui.page.subscribe("t", lambda *args: seen.append(args))
+    )
+
+    broadcast(windows, "t", {"n": 1})
+    broadcast(windows, "t", {"n": 2})
+
+    await until(lambda: all(w.gui.page.topics.get("t") == {"n": 2} for w in windows))
+    await until(lambda: all(w._publishing is None for w in windows))
+    assert seen[-1] == ({"n": 2}, "t")
@@ -0,0 +1,22 @@
+import asyncio
+import json
+
+
+async def echo(value):
+    return value
+
+
+async def test_create_window_trace_is_saved_on_close(open_window, tmp_path):
+    filename = tmp_path / "session.json"
+    window = await open_window(js_api=[echo], trace=str(filename))
+
+    assert await asyncio.wrap_future(window.gui.page.api.echo(1)) == 1
+
+    window.gui.close()
+    await window.closed.wait()
+
+    while not filename.exists():
+        await asyncio.sleep(0.01)
+
+    names = {event["name"] for event in json.loads(filename.read_text())["traceEvents"]}
+    assert {"loop.hop", "api.echo"} <= names
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from webview2.error import JSError
+from webview2.protocol import CALL
+from webview2.transfer import Transfer
+
+
+def round_trip(value, threshold=16, chunk_size=8):
+    sender = Transfer(threshold, chunk_size)
+    receiver = Transfer(threshold, chunk_size)
+    chunks = []
+    encoded, has_binary = sender.encode(value, chunks.append)
+
+    for chunk in reversed(chunks):
+        receiver.receive(chunk)
+
+    return receiver, encoded, has_binary, chunks
+
+
+def test_small_bytes_are_inlined():
+    receiver, encoded, has_binary, chunks = round_trip([b"abc", "text"])
+
+    assert has_binary
+    assert chunks == []
+    assert receiver.decode(encoded) == [b"abc", "text"]
+
+
+def test_large_bytes_are_chunked_and_reassembled():
+    data = bytes(range(100))
+    receiver, encoded, has_binary, chunks = round_trip({"blob": data, "n": 1})
+
+    assert len(chunks) == 13
+    assert encoded["blob"] == {"$transfer": "py-0", "size": 100}
+    assert receiver.decode(encoded) == {"blob": data, "n": 1}
+    assert receiver._complete == {}
+
+
+def test_discard_releases_reassembled_blobs():
+    receiver, encoded, _, _ = round_trip([{"a": b"x" * 40}, b"y" * 40])
+
+    assert len(receiver._complete) == 2
+    receiver.discard(encoded)
+    assert receiver._complete == {}
+
+
+def test_plain_values_pass_through():
+    receiver, encoded, has_binary, _ = round_trip({"a": [1, None, "s"]})
+
+    assert not has_binary
+    assert receiver.decode(encoded) == {"a": [1, None, "s"]}
+
+
+def slow_blob():
+    time.sleep(0.2)
+    return b"x" * 100_000
+
+
+async def test_late_result_releases_transfer(open_window):
+    window = await open_window(functions={"slow_blob": slow_blob})
+
+    with pytest.raises(asyncio.TimeoutError):
+        await window.call("slow_blob", timeout=0.05)
+
+    await asyncio.sleep(0.3)
+    assert window._transfer._complete == {}
+
+
+async def test_unknown_api_is_rejected_and_released(open_window):
+    window = await open_window()
+
+    with pytest.raises(JSError) as info:
+        await asyncio.wrap_future(window.gui.page.api.missing(b"x" * 100_000))
+
+    assert info.value.name == "NameError"
+    assert window._transfer._complete == {}
+
+
+async def echo(value):
+    return value
+
+
+async def test_missing_transfer_settles_the_call(open_window):
+    window = await open_window(js_api=[echo])
+    page = window.gui.page
+    future = Future()
+
+    def post():
+        page.promises[99] = future
+        page.post(CALL, 99, "echo", [{"$transfer": "js-missing", "size": 3}])
+
+    window.gui.invoke(post)
+
+    with pytest.raises(JSError) as info:
+        await asyncio.wrap_future(future)
+
+    assert info.value.name == "KeyError"
+
+
+@pytest.mark.parametrize("threshold, chunked", [(1000, True), (None, False)])
+async def test_page_uses_the_configured_threshold(open_window, threshold, chunked):
+    window = await open_window(js_api=[echo], transfer_threshold=threshold)
+    received = []
+    receive = window._transfer.receive
+
+    def record(message):
+        received.append(message)
+        receive(message)
+
+    window._transfer.receive = record
+    data = b"x" * 2000
+
+    assert await asyncio.wrap_future(window.gui.page.api.echo(data)) == data
+    assert bool(received) == chunked
+
+
+async def test_transfer_ids_stay_unique_across_navigation(open_window):
+    window = await open_window(functions={"size": len}, transfer_threshold=16)
+    ids = []
+    post_chunk = window._post_chunk
+
+    def record(message):
+        ids.append(message.split(":")[0])
+        post_chunk(message)
+
+    window._post_chunk = record
+
+    assert await window.call("size", b"x" * 100) == 100
+    await window.fetch_url("https://app.local/next")
+    assert await window.call("size", b"y" * 100) == 100
+
+    assert ids == ["py-0", "py-1"]
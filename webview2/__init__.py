@@ -1,8 +1,24 @@
-import asyncio
+from importlib import import_module
 
-from webview2.gui import WpfGui, initialize_gui
-from webview2.utils import DragMover, a
-from webview2.window import Window
+exports = {
+    "broadcast": "webview2.window",
+    "cached": "webview2.cache",
+    "configure_scheduler": "webview2.scheduler",
+    "DragMover": "webview2.utils",
+    "Window": "webview2.window",
+    "configure_pools": "webview2.executor",
+    "priority": "webview2.scheduler",
+    "register_backend": "webview2.backend",
+    "run_in": "webview2.executor",
+    "a": "webview2.utils",
+}
+
+
+def __getattr__(name):
+    if name in exports:
+        return getattr(import_module(exports[name]), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_window(
@@ -19,8 +35,22 @@ def create_window(
     minimized=False,
     hidden=False,
     js_api=(),
+    batch_calls=False,
+    transfer_threshold=None,
+    call_timeout=None,
+    max_pending_calls=None,
+    max_concurrent_calls=None,
+    max_queued_calls=None,
+    protocol=2,
+    backend=None,
+    group=None,
+    metrics=False,
+    trace=None,
 ):
-    gui, cookie_manager, ipc, navigate_handler = WpfGui.create(
+    from webview2.backend import get_backend
+    from webview2.window import Window
+
+    gui, cookie_manager, ipc, navigate_handler = get_backend(backend).create(
         title=title,
         size=size,
         position=position,
@@ -32,6 +62,7 @@ def create_window(
         maximized=maximized,
         minimized=minimized,
         hidden=hidden,
+        group=group,
     )
     return Window(
         url,
@@ -40,13 +71,58 @@ def create_window(
         cookie_manager=cookie_manager,
         ipc=ipc,
         navigate_handler=navigate_handler,
+        batch_calls=batch_calls,
+        transfer_threshold=transfer_threshold,
+        call_timeout=call_timeout,
+        max_pending_calls=max_pending_calls,
+        protocol=protocol,
+        metrics=metrics,
+        max_concurrent_calls=max_concurrent_calls,
+        max_queued_calls=max_queued_calls,
+        trace=trace,
     )
 
 
+def prewarm_windows(size, backend=None):
+    from webview2.backend import get_backend
+
+    get_backend(backend).prewarm(size)
+
+
+def window_open_stats(backend=None):
+    from webview2.backend import get_backend
+
+    return get_backend(backend).open_stats()
+
+
 async def start_windows(*windows, join=True):
-    await initialize_gui(*windows)
+    import asyncio
+
+    backends = {}
+    for window in windows:
+        backends.setdefault(type(window.gui), []).append(window)
+
+    await asyncio.gather(
+        *(backend.start(*group) for backend, group in backends.items())
+    )
+
     if join:
         await asyncio.gather(*(window.closed.wait() for window in windows))
 
 
-__all__ = ["DragMover", "Window", "create_window", "start_windows", "a"]
+__all__ = [
+    "DragMover",
+    "Window",
+    "broadcast",
+    "cached",
+    "configure_pools",
+    "configure_scheduler",
+    "create_window",
+    "prewarm_windows",
+    "priority",
+    "register_backend",
+    "run_in",
+    "start_windows",
+    "window_open_stats",
+    "a",
+]
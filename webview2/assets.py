@@ -0,0 +1,383 @@
+import gzip
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+import threading
+import zipfile
+from collections import OrderedDict
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = re.compile(
+    r"text/|application/(javascript|json|xml|wasm|manifest\+json)|image/svg\+xml"
+)
+MIN_COMPRESS_SIZE = 1024
+ENCODINGS = ("br", "gzip")
+range_pattern = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def accept_weights(header):
+    weights = {}
+
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+
+        if not coding:
+            continue
+
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+
+        weights[coding] = weight
+
+    return weights
+
+
+class Response:
+    def __init__(self, status, headers=None, body=b""):
+        self.status = status
+        self.headers = headers or {}
+        self.body = body
+
+    @property
+    def reason(self):
+        return HTTPStatus(self.status).phrase
+
+    def header_text(self):
+        return "\r\n".join(f"{name}: {value}" for name, value in self.headers.items())
+
+
+class Asset:
+    def __init__(self, path, version, data, size):
+        self.path = path
+        self.version = version
+        self.data = data
+        self.size = size
+        self.variants = {}
+        self.etag = f'"{version}"'
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    @property
+    def nbytes(self):
+        return (0 if self.data is None else len(self.data)) + sum(
+            len(variant) for variant in self.variants.values() if variant is not None
+        )
+
+
+class DirectorySource:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    def _file(self, path):
+        return os.path.join(self.root, *path.split("/"))
+
+    def version(self, path):
+        try:
+            result = os.stat(self._file(path))
+        except OSError:
+            return None
+
+        if not stat.S_ISREG(result.st_mode):
+            return None
+
+        return f"{result.st_size:x}-{result.st_mtime_ns:x}"
+
+    def load(self, path, version, max_size):
+        with open(self._file(path), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            data = f.read() if size <= max_size else None
+
+        return Asset(path, version, data, size)
+
+    def read(self, path, start, end):
+        with open(self._file(path), "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def precompressed(self, path, encoding):
+        suffix = {"br": ".br", "gzip": ".gz"}[encoding]
+        variant = self._file(path) + suffix
+
+        if os.path.isfile(variant) and os.path.getmtime(variant) >= os.path.getmtime(
+            self._file(path)
+        ):
+            with open(variant, "rb") as f:
+                return f.read()
+
+
+class ZipSource:
+    def __init__(self, path):
+        self.zip = zipfile.ZipFile(path)
+        self.lock = threading.Lock()
+        self.entries = {
+            info.filename: info for info in self.zip.infolist() if not info.is_dir()
+        }
+
+    def version(self, path):
+        info = self.entries.get(path)
+        return info and f"{info.file_size:x}-{info.CRC:x}"
+
+    def load(self, path, version, max_size):
+        with self.lock:
+            data = self.zip.read(path)
+
+        return Asset(path, version, data, len(data))
+
+    def read(self, path, start, end):
+        with self.lock:
+            return self.zip.read(path)[start:end]
+
+    def precompressed(self, path, encoding):
+        suffix = {"br": ".br", "gzip": ".gz"}[encoding]
+
+        if path + suffix in self.entries:
+            with self.lock:
+                return self.zip.read(path + suffix)
+
+
+class AssetServer:
+    def __init__(
+        self,
+        root,
+        origin="https://app.local",
+        index="index.html",
+        fallback=None,
+        cache_bytes=64 << 20,
+        max_cached_file=4 << 20,
+        cache_control="no-cache",
+        workers=4,
+    ):
+        self.origin = origin.rstrip("/")
+        self.index = index
+        self.fallback = fallback
+        self.cache_bytes = cache_bytes
+        self.max_cached_file = max_cached_file
+        self.cache_control = cache_control
+        self.workers = workers
+        self.source = (
+            ZipSource(root)
+            if os.path.isfile(root) and zipfile.is_zipfile(root)
+            else DirectorySource(root)
+        )
+        self.hits = self.misses = 0
+        self._assets = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def submit(self, func):
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="assets"
+                )
+
+        return self._executor.submit(func)
+
+    def matches(self, url):
+        return url == self.origin or url.startswith(self.origin + "/")
+
+    def _path(self, url):
+        path = posixpath.normpath("/" + unquote(urlsplit(url).path)).lstrip("/")
+
+        if "\\" in path or ":" in path:
+            return None
+
+        if not path or path == ".":
+            return self.index
+
+        if self.source.version(path) is None and self.index:
+            index = posixpath.join(path, self.index)
+            if self.source.version(index) is not None:
+                return index
+
+        return path
+
+    def _asset(self, path):
+        version = path and self.source.version(path)
+
+        if version is None:
+            return None
+
+        with self._lock:
+            asset = self._assets.get(path)
+
+            if asset and asset.version == version:
+                self._assets.move_to_end(path)
+                self.hits += 1
+                return asset
+
+        asset = self.source.load(path, version, self.max_cached_file)
+
+        with self._lock:
+            self.misses += 1
+            if path in self._assets:
+                self._cached_bytes -= self._assets.pop(path).nbytes
+
+            self._assets[path] = asset
+            self._cached_bytes += asset.nbytes
+            self._evict()
+
+        return asset
+
+    def _evict(self):
+        while self._cached_bytes > self.cache_bytes and len(self._assets) > 1:
+            self._cached_bytes -= self._assets.popitem(last=False)[1].nbytes
+
+    def _variant(self, asset, encoding):
+        if asset.data is None:
+            return None
+
+        if encoding not in asset.variants:
+            data = self.source.precompressed(asset.path, encoding)
+
+            if (
+                data is None
+                and asset.size >= MIN_COMPRESS_SIZE
+                and COMPRESSIBLE.match(asset.content_type)
+            ):
+                if encoding == "gzip":
+                    data = gzip.compress(asset.data, mtime=0)
+                elif brotli is not None:
+                    data = brotli.compress(asset.data)
+
+            with self._lock:
+                if encoding not in asset.variants:
+                    asset.variants[encoding] = data
+
+                    if data is not None and self._assets.get(asset.path) is asset:
+                        self._cached_bytes += len(data)
+                        self._evict()
+
+        return asset.variants[encoding]
+
+    def _encoding(self, asset, accept_encoding):
+        weights = accept_weights(accept_encoding)
+        default = weights.get("*", 0)
+        ranked = sorted(
+            ENCODINGS, key=lambda encoding: weights.get(encoding, default), reverse=True
+        )
+
+        for encoding in ranked:
+            if weights.get(encoding, default) <= 0:
+                break
+
+            if self._variant(asset, encoding) is not None:
+                return encoding
+
+    def _read(self, asset, start, end):
+        if asset.data is None:
+            return self.source.read(asset.path, start, end)
+
+        if start == 0 and end == asset.size:
+            return asset.data
+
+        return asset.data[start:end]
+
+    def handle(self, method, url, headers=None):
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+
+        if method not in ("GET", "HEAD"):
+            return Response(405, {"Allow": "GET, HEAD"})
+
+        asset = self._asset(self._path(url))
+
+        if asset is None and self.fallback:
+            asset = self._asset(self.fallback)
+
+        if asset is None:
+            return Response(404, {"Content-Type": "text/plain"}, b"Not Found")
+
+        range_header = headers.get("range")
+
+        if range_header and not range_pattern.fullmatch(range_header.strip()):
+            range_header = None
+
+        encoding = (
+            None
+            if range_header
+            else self._encoding(asset, headers.get("accept-encoding", ""))
+        )
+        etag = f'"{asset.version}-{encoding}"' if encoding else asset.etag
+        response_headers = {
+            "Content-Type": asset.content_type,
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Accept-Ranges": "bytes",
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag in (tag.strip() for tag in if_none_match.split(","))
+        ):
+            return Response(304, response_headers)
+
+        if encoding:
+            body = self._variant(asset, encoding)
+            response_headers["Content-Encoding"] = encoding
+            response_headers["Content-Length"] = str(len(body))
+            return Response(200, response_headers, b"" if method == "HEAD" else body)
+
+        elif range_header:
+            byte_range = self._range(range_header, asset.size)
+
+            if byte_range is None:
+                response_headers["Content-Range"] = f"bytes */{asset.size}"
+                return Response(416, response_headers)
+
+            start, end = byte_range
+            response_headers["Content-Range"] = f"bytes {start}-{end}/{asset.size}"
+            status = 206
+
+        else:
+            start, end = 0, asset.size - 1
+            status = 200
+
+        response_headers["Content-Length"] = str(end + 1 - start)
+        body = b"" if method == "HEAD" else self._read(asset, start, end + 1)
+        return Response(status, response_headers, body)
+
+    def _range(self, header, size):
+        match = range_pattern.fullmatch(header.strip())
+
+        if not match or not any(match.groups()):
+            return None
+
+        start, end = match.groups()
+
+        if not start:
+            start, end = max(size - int(end), 0), size - 1
+        else:
+            start, end = int(start), min(int(end) if end else size - 1, size - 1)
+
+        if start > end or start >= size:
+            return None
+
+        return start, end
+
+    def stats(self):
+        return {
+            "assets": len(self._assets),
+            "cached_bytes": self._cached_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import time
+import traceback
+from abc import ABC, abstractmethod
+from collections import deque
+from importlib import import_module
+
+from webview2.utils import (
+    invoke_in_gui_async,
+    invoke_in_gui_nowait,
+    load_js_api,
+    settle,
+)
+
+backends = {
+    "wpf": "webview2.gui:WpfGui",
+    "loopback": "webview2.loopback:LoopbackGui",
+}
+default_backend = "wpf"
+
+
+def register_backend(name, path):
+    backends[name] = path
+
+
+def get_backend(name=None):
+    module, _, cls = backends[name or default_backend].partition(":")
+    return getattr(import_module(module), cls)
+
+
+class Invoker(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        for name, attr in list(vars(cls).items()):
+            func = getattr(attr, "gui_func", None)
+
+            if func is not None:
+                setattr(cls, f"{name}_async", invoke_in_gui_async(func))
+                setattr(cls, f"{name}_nowait", invoke_in_gui_nowait(func))
+
+    def invoke_async(self, func):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        metrics = self.metrics
+        queued = time.perf_counter()
+
+        def run():
+            if metrics:
+                metrics.since("dispatcher.queue.ms", queued)
+
+            try:
+                result = func()
+
+            except Exception as e:
+                loop.call_soon_threadsafe(settle, future, None, e)
+
+            else:
+                loop.call_soon_threadsafe(settle, future, result)
+
+        self.begin_invoke(run)
+        return future
+
+    def invoke_nowait(self, func):
+        metrics = self.metrics
+        queued = time.perf_counter()
+
+        def run():
+            if metrics:
+                metrics.since("dispatcher.queue.ms", queued)
+
+            try:
+                func()
+
+            except Exception:
+                traceback.print_exc()
+
+        self.begin_invoke(run)
+
+
+class Batch:
+    def __init__(self, gui):
+        object.__setattr__(self, "_gui", gui)
+        object.__setattr__(self, "_changes", [])
+
+    def __setattr__(self, name, value):
+        self._changes.append(lambda: setattr(self._gui, name, value))
+
+    def __getattr__(self, name):
+        method = getattr(self._gui, name)
+        return lambda *args, **kwargs: self._changes.append(
+            lambda: method(*args, **kwargs)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and self._changes:
+            self._gui.invoke(lambda: self._gui.apply(self._changes))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None and self._changes:
+            await self._gui.invoke_async(lambda: self._gui.apply(self._changes))
+
+
+class Gui(Invoker):
+    open_latencies = {}
+    metrics = None
+
+    class CookieManager(Invoker):
+        def __init__(self, gui):
+            self.gui = gui
+
+        def invoke(self, func):
+            return self.gui.invoke(func)
+
+        def begin_invoke(self, func):
+            return self.gui.begin_invoke(func)
+
+        @property
+        def metrics(self):
+            return self.gui.metrics
+
+        @abstractmethod
+        def add_cookie(self, name, value, domain=None, path=None): ...
+
+        @abstractmethod
+        def add_cookies(self, cookies): ...
+
+        @abstractmethod
+        def delete_cookies(self, cookies=None): ...
+
+        @abstractmethod
+        def get_cookies(self, url, callback): ...
+
+    class IPCHandler(Invoker):
+        def __init__(self, gui):
+            self.gui = gui
+            self.handle_ipc = None
+            self.handle_reset = None
+            self.handle_bridge = None
+            self.bridge_config = {}
+
+        def invoke(self, func):
+            return self.gui.invoke(func)
+
+        def begin_invoke(self, func):
+            return self.gui.begin_invoke(func)
+
+        @property
+        def metrics(self):
+            return self.gui.metrics
+
+        @abstractmethod
+        def initialize(self): ...
+
+        def bridge_script(self):
+            return f"{load_js_api()}\nwebview._init({json.dumps(self.bridge_config)});"
+
+        def preload_script(self):
+            config = {**self.bridge_config, "generation": None}
+            return f"{load_js_api()}\nwebview._init({json.dumps(config)});\nwebview._ready();"
+
+        def bridge_initialized(self, result, is_exc):
+            self.handle_bridge(result if not is_exc and result else 1)
+
+        def handle_web_message(self, message, received=None, size=None):
+            self.handle_ipc(message, received, size)
+
+        def call_js(self, calls, callback=None):
+            if len(calls) == 1:
+                ((call_id, script),) = calls
+                return self.evaluate_js(
+                    f"webview._callJs({json.dumps(call_id)}, async () => {{ {script} }})",
+                    callback,
+                )
+
+            calls = ", ".join(
+                f"[{json.dumps(call_id)}, {json.dumps(script)}]"
+                for call_id, script in calls
+            )
+            return self.evaluate_js(f"webview._callJsBatch([{calls}])", callback)
+
+        @abstractmethod
+        def post_message(self, message): ...
+
+        @abstractmethod
+        def post_json(self, message): ...
+
+        @abstractmethod
+        def evaluate_js(self, script, callback=None): ...
+
+    class NavigateHandler(Invoker):
+        def __init__(self, gui):
+            self.gui = gui
+
+        def invoke(self, func):
+            return self.gui.invoke(func)
+
+        def begin_invoke(self, func):
+            return self.gui.begin_invoke(func)
+
+        @property
+        def metrics(self):
+            return self.gui.metrics
+
+        @abstractmethod
+        def navigate_to(self, url): ...
+
+    @classmethod
+    def create(cls, **options):
+        gui = cls(**options)
+        return (
+            gui,
+            cls.CookieManager(gui),
+            cls.IPCHandler(gui),
+            cls.NavigateHandler(gui),
+        )
+
+    @classmethod
+    @abstractmethod
+    async def start(cls, *windows): ...
+
+    @classmethod
+    def prewarm(cls, size):
+        pass
+
+    @classmethod
+    def record_open(cls, kind, seconds):
+        cls.open_latencies.setdefault(kind, deque(maxlen=1000)).append(seconds)
+
+    @classmethod
+    def open_stats(cls):
+        return {
+            kind: {
+                "count": len(latencies),
+                "mean_ms": sum(latencies) / len(latencies) * 1000,
+                "last_ms": latencies[-1] * 1000,
+            }
+            for kind, latencies in cls.open_latencies.items()
+        }
+
+    @abstractmethod
+    def initialize(self, window): ...
+
+    def batch(self):
+        return Batch(self)
+
+    @abstractmethod
+    def add_asset_server(self, server): ...
+
+    def apply(self, changes):
+        for change in changes:
+            change()
+
+    @abstractmethod
+    def begin_invoke(self, func): ...
+
+    @abstractmethod
+    def invoke(self, func): ...
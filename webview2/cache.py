@@ -0,0 +1,102 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+
+
+def cache_key(args):
+    return json.dumps(args, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+def cached(maxsize=128, ttl=None):
+    def decorator(func):
+        func.cache = ResultCache(maxsize, ttl)
+        return func
+
+    return decorator
+
+
+class ResultCache:
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = self.misses = self.coalesced = self.evictions = 0
+        self._results = OrderedDict()
+        self._inflight = {}
+        self._generation = 0
+
+    def _lookup(self, key):
+        if key not in self._results:
+            return False, None
+
+        result, expires = self._results[key]
+
+        if expires is not None and expires <= time.monotonic():
+            del self._results[key]
+            return False, None
+
+        self._results.move_to_end(key)
+        return True, result
+
+    def _store(self, key, result):
+        expires = self.ttl and time.monotonic() + self.ttl
+        self._results[key] = result, expires
+        self._results.move_to_end(key)
+
+        while self.maxsize and len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+            self.evictions += 1
+
+    async def _run(self, key, func):
+        generation = self._generation
+
+        try:
+            result = await func()
+
+            if generation == self._generation:
+                self._store(key, result)
+
+            return result
+
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    async def call(self, args, func):
+        key = cache_key(args)
+        found, result = self._lookup(key)
+
+        if found:
+            self.hits += 1
+            return result
+
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            self._inflight[key] = asyncio.ensure_future(self._run(key, func))
+
+        return await asyncio.shield(self._inflight[key])
+
+    def invalidate(self, *args):
+        self._generation += 1
+
+        if args:
+            key = cache_key(list(args))
+            self._results.pop(key, None)
+            self._inflight.pop(key, None)
+        else:
+            self._results.clear()
+            self._inflight.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+
+        return {
+            "size": len(self._results),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0,
+        }
@@ -0,0 +1,107 @@
+from http.cookiejar import HTTPONLY_ATTR, Cookie, CookieJar, MozillaCookieJar
+from urllib.parse import urlsplit
+
+
+def cookie(
+    name,
+    value,
+    domain=None,
+    path="/",
+    expires=None,
+    secure=False,
+    http_only=False,
+):
+    return {
+        "name": name,
+        "value": value,
+        "domain": domain,
+        "path": path or "/",
+        "expires": expires,
+        "secure": secure,
+        "http_only": http_only,
+    }
+
+
+def normalize(cookies):
+    if isinstance(cookies, CookieJar):
+        return from_cookiejar(cookies)
+
+    return [item if isinstance(item, dict) else cookie(*item) for item in cookies]
+
+
+def matches(cookie, url):
+    if url is None:
+        return True
+
+    parts = urlsplit(url)
+    domain = cookie["domain"] or ""
+    host = parts.hostname or ""
+    path = parts.path or "/"
+    prefix = cookie["path"] or "/"
+
+    return (
+        (
+            not domain
+            or host == domain.lstrip(".")
+            or (domain.startswith(".") and host.endswith(domain))
+        )
+        and (path == prefix or path.startswith(prefix.rstrip("/") + "/"))
+        and (parts.scheme == "https" or not cookie["secure"])
+    )
+
+
+def from_cookiejar(jar):
+    return [
+        cookie(
+            item.name,
+            item.value,
+            item.domain,
+            item.path,
+            item.expires,
+            item.secure,
+            item.has_nonstandard_attr("HttpOnly")
+            or item.has_nonstandard_attr(HTTPONLY_ATTR),
+        )
+        for item in jar
+    ]
+
+
+def to_cookiejar(cookies, jar=None):
+    jar = MozillaCookieJar() if jar is None else jar
+
+    for item in normalize(cookies):
+        domain = item["domain"] or ""
+        jar.set_cookie(
+            Cookie(
+                version=0,
+                name=item["name"],
+                value=item["value"],
+                port=None,
+                port_specified=False,
+                domain=domain,
+                domain_specified=bool(domain),
+                domain_initial_dot=domain.startswith("."),
+                path=item["path"],
+                path_specified=True,
+                secure=item["secure"],
+                expires=item["expires"] and int(item["expires"]),
+                discard=item["expires"] is None,
+                comment=None,
+                comment_url=None,
+                rest={HTTPONLY_ATTR: None} if item["http_only"] else {},
+            )
+        )
+
+    return jar
+
+
+def load_netscape(filename):
+    jar = MozillaCookieJar(filename)
+    jar.load(ignore_discard=True, ignore_expires=True)
+    return from_cookiejar(jar)
+
+
+def save_netscape(cookies, filename):
+    to_cookiejar(cookies, MozillaCookieJar(filename)).save(
+        ignore_discard=True, ignore_expires=True
+    )
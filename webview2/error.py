@@ -2,6 +2,18 @@ class GuiNotInitializedError(Exception):
     pass
 
 
+class CallCancelledError(Exception):
+    pass
+
+
+class TooManyCallsError(Exception):
+    pass
+
+
+class OverloadedError(Exception):
+    pass
+
+
 class JSError(Exception):
     def __init__(self, json_result):
         self.name = json_result["name"]
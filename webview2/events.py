@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import traceback
+from collections import deque
+from inspect import isawaitable
+
+from webview2.utils import Event
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+BLOCK = "block"
+
+
+class Subscription:
+    def __init__(self, stream, buffer, overflow):
+        if overflow not in (DROP_OLDEST, COALESCE, BLOCK):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+
+        self.stream = stream
+        self.buffer = buffer
+        self.overflow = overflow
+        self.dropped = 0
+        self.delivered = 0
+        self.closed = False
+        self.task = None
+        self._items = deque()
+        self._ready = asyncio.Event()
+        self._slots = threading.Semaphore(buffer) if overflow == BLOCK else None
+
+    def reserve(self):
+        if self._slots is None or self.closed:
+            return False
+
+        if asyncio._get_running_loop() is self.stream._loop:
+            return self._slots.acquire(blocking=False)
+
+        self._slots.acquire()
+        return not self.closed
+
+    def push(self, args, held):
+        if self.closed:
+            return
+
+        if len(self._items) >= self.buffer:
+            if self.overflow == DROP_OLDEST:
+                self._items.popleft()
+                self.dropped += 1
+            elif self.overflow == COALESCE:
+                self._items.pop()
+                self.dropped += 1
+            elif not held:
+                _, held = self._items.popleft()
+                self.dropped += 1
+
+        self._items.append((args, held))
+        self._ready.set()
+
+    def close(self):
+        if self.closed:
+            return
+
+        self.closed = True
+        self._ready.set()
+
+        if self in self.stream.subscribers:
+            self.stream.subscribers.remove(self)
+            self.stream.closed_dropped += self.dropped
+
+        if self._slots is not None:
+            self._slots.release(self.buffer)
+
+    async def aclose(self):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._items:
+            if self.closed:
+                raise StopAsyncIteration
+
+            self._ready.clear()
+            await self._ready.wait()
+
+        args, held = self._items.popleft()
+
+        if held:
+            self._slots.release()
+
+        self.delivered += 1
+        return args
+
+    def stats(self):
+        return {
+            "buffered": len(self._items),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+class EventStream(Event):
+    def __init__(self, init_args=None, buffer=64, overflow=DROP_OLDEST):
+        super().__init__(init_args)
+
+        self.buffer = buffer
+        self.overflow = overflow
+        self.subscribers = []
+        self.closed_dropped = 0
+
+    @property
+    def dropped(self):
+        return self.closed_dropped + sum(
+            subscriber.dropped for subscriber in self.subscribers
+        )
+
+    def set(self, *args):
+        held = [subscriber for subscriber in self.subscribers if subscriber.reserve()]
+        self._loop.call_soon_threadsafe(self._set, args, held)
+
+    def _set(self, args, held=()):
+        super()._set(args)
+
+        for subscriber in list(self.subscribers):
+            subscriber.push(args, subscriber in held)
+
+    def subscribe(self, callback=None, buffer=None, overflow=None):
+        subscription = Subscription(
+            self, buffer or self.buffer, overflow or self.overflow
+        )
+        self.subscribers.append(subscription)
+
+        if callback:
+            subscription.task = self._loop.create_task(
+                self._deliver(subscription, callback)
+            )
+
+        return subscription
+
+    async def _deliver(self, subscription, callback):
+        async for args in subscription:
+            try:
+                result = callback(*args)
+
+                if isawaitable(result):
+                    await result
+
+            except Exception:
+                traceback.print_exc()
+
+    def close(self):
+        for subscriber in list(self.subscribers):
+            subscriber.close()
+
+    async def __aiter__(self):
+        subscription = self.subscribe()
+
+        try:
+            async for args in subscription:
+                yield args
+        finally:
+            subscription.close()
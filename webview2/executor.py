@@ -0,0 +1,115 @@
+import asyncio
+import atexit
+import inspect
+from contextlib import nullcontext
+from functools import partial
+
+from webview2.cache import ResultCache
+from webview2.scheduler import NORMAL
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+
+pool_sizes = {THREAD: None, PROCESS: None}
+pools = {}
+
+
+def configure_pools(thread_workers=None, process_workers=None):
+    for pool in pools.values():
+        pool.shutdown(wait=False)
+
+    pools.clear()
+    pool_sizes[THREAD] = thread_workers
+    pool_sizes[PROCESS] = process_workers
+
+
+def get_pool(policy):
+    if policy not in pools:
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor if policy == THREAD else ProcessPoolExecutor
+        pools[policy] = executor(pool_sizes[policy])
+        atexit.register(pools[policy].shutdown)
+
+    return pools[policy]
+
+
+def run_in(policy, max_concurrency=None):
+    def decorator(func):
+        func.policy = policy
+        func.max_concurrency = max_concurrency
+        return func
+
+    return decorator
+
+
+def is_async(func):
+    return inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func)
+
+
+class Handler:
+    def __init__(
+        self, func, policy=None, max_concurrency=None, cache=None, priority=None
+    ):
+        self.func = func
+        self.policy = (
+            policy
+            or getattr(func, "policy", None)
+            or (INLINE if is_async(func) else THREAD)
+        )
+        self.max_concurrency = max_concurrency or getattr(func, "max_concurrency", None)
+        self.cache = (
+            ResultCache() if cache is True else cache or getattr(func, "cache", None)
+        )
+        self.priority = (
+            getattr(func, "priority", NORMAL) if priority is None else priority
+        )
+        self._semaphore = None
+
+        if self.policy not in (INLINE, THREAD, PROCESS):
+            raise ValueError(f"Unknown execution policy {self.policy!r}")
+
+        if self.policy != INLINE and is_async(func):
+            raise ValueError(f"{func.__name__} is async and can only run inline")
+
+        if self.cache and inspect.isasyncgenfunction(func):
+            raise ValueError(f"{func.__name__} streams results and cannot be cached")
+
+    async def _run(self, args):
+        if self.policy == INLINE:
+            result = self.func(*args)
+            return await result if inspect.isawaitable(result) else result
+
+        return await asyncio.get_running_loop().run_in_executor(
+            get_pool(self.policy), partial(self.func, *args)
+        )
+
+    async def __call__(self, *args):
+        if self.cache:
+            return await self.cache.call(args, lambda: self._limited(args))
+
+        return await self._limited(args)
+
+    def _slot(self):
+        if not self.max_concurrency:
+            return nullcontext()
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._semaphore
+
+    async def _limited(self, args):
+        async with self._slot():
+            return await self._run(args)
+
+    async def stream(self, args):
+        async with self._slot():
+            stream = self.func(*args)
+
+            try:
+                async for item in stream:
+                    yield item
+            finally:
+                await stream.aclose()
@@ -1,29 +1,40 @@
+import asyncio
 import json
 import os
+import time
+from functools import partial
 
 import clr
 
+from webview2.backend import Gui
+from webview2.assets import Response
+from webview2.cookies import cookie
 from webview2.error import GuiNotInitializedError
+from webview2.executor import THREAD, get_pool
 from webview2.lib import path as lib_path
-from webview2.utils import Event, invoke_in_gui, is_64bit, js_api, try_except
+from webview2.utils import Event, StateMirror, invoke_in_gui, is_64bit, try_except
 
 os.environ["Path"] += f";{lib_path / 'x64' if is_64bit() else 'x86'}"
 clr.AddReference(str(lib_path / "Microsoft.Web.WebView2.Core.dll"))
 clr.AddReference(str(lib_path / "Microsoft.Web.WebView2.Wpf.dll"))
 clr.AddReference(str(lib_path / "ControlzEx.dll"))
 clr.AddReference(str(lib_path / "Microsoft.Xaml.Behaviors.dll"))
+clr.AddReference("System.Xaml")
 
+from Microsoft.Web.WebView2.Core import CoreWebView2WebResourceContext
 from Microsoft.Web.WebView2.Wpf import WebView2
-from System import Action, Func, Type, Uri
+from System import Action, DateTime, DateTimeKind, Func, Type, Uri
 from System.Drawing import Color, Size
-from System.IO import StreamReader
+from System.IO import MemoryStream, StringReader
 from System.Threading import ApartmentState, Thread, ThreadStart
-from System.Threading.Tasks import Task
+from System.Threading.Tasks import Task, TaskScheduler
 from System.Windows import (
     Application,
     CornerRadius,
     Interop,
     ResizeMode,
+    ShutdownMode,
+    SystemParameters,
     Thickness,
     WindowStartupLocation,
     WindowState,
@@ -33,6 +44,12 @@ from System.Windows.Controls import Border
 from System.Windows.Markup import XamlReader
 from System.Windows.Media import BrushConverter
 from System.Windows.Shell import NonClientFrameEdges, WindowChrome
+from System.Windows.Threading import Dispatcher, DispatcherPriority
+from System.Xaml import XamlNodeList, XamlServices, XamlXmlReader
+from System.Xml import XmlReader
+
+default_xaml_path = str(lib_path / "Main.xaml")
+epoch = DateTime(1970, 1, 1, 0, 0, 0, DateTimeKind.Utc)
 
 
 class NotInitializedGui:
@@ -43,18 +60,18 @@ class NotInitializedGui:
         raise GuiNotInitializedError()
 
 
-class WpfGui:
+class WpfGui(Gui):
     instances = []
     app = None
     app_created = None
-
-    class CookieManager:
-        def __init__(self, gui):
-            self.gui = gui
-
-        def invoke(self, func):
-            return self.gui.invoke(func)
-
+    dispatchers = {}
+    starting = {}
+    templates = {}
+    pool = []
+    pool_size = 0
+    open_latencies = {}
+
+    class CookieManager(Gui.CookieManager):
         @invoke_in_gui
         def add_cookie(self, name, value, domain=None, path=None):
             cookie = self.gui.browser.web_view.CoreWebView2.CookieManager.CreateCookie(
@@ -64,24 +81,86 @@ class WpfGui:
                 cookie
             )
 
-    class IPCHandler:
-        def __init__(self, gui):
-            self.gui = gui
-            self.handle_ipc = None
+        @invoke_in_gui
+        def add_cookies(self, cookies):
+            manager = self.gui.browser.web_view.CoreWebView2.CookieManager
 
-        def invoke(self, func):
-            return self.gui.invoke(func)
+            for item in cookies:
+                cookie = manager.CreateCookie(
+                    item["name"], item["value"], item["domain"], item["path"]
+                )
+                cookie.IsSecure = item["secure"]
+                cookie.IsHttpOnly = item["http_only"]
 
-        def initialize(self):
-            self.evaluate_js(
-                js_api,
-                lambda *_: self.gui.window.navigated.set(
-                    str(self.gui.browser.web_view.Source)
-                ),
+                if item["expires"] is not None:
+                    cookie.Expires = epoch.AddSeconds(item["expires"]).ToLocalTime()
+
+                manager.AddOrUpdateCookie(cookie)
+
+        @invoke_in_gui
+        def delete_cookies(self, cookies=None):
+            manager = self.gui.browser.web_view.CoreWebView2.CookieManager
+
+            if cookies is None:
+                manager.DeleteAllCookies()
+                return
+
+            for item in cookies:
+                manager.DeleteCookiesWithDomainAndPath(
+                    item["name"], item["domain"], item["path"]
+                )
+
+        @invoke_in_gui
+        def get_cookies(self, url, callback):
+            def on_cookies(task):
+                if task.IsFaulted:
+                    callback(task.Exception, True)
+                    return
+
+                callback(
+                    [
+                        cookie(
+                            item.Name,
+                            item.Value,
+                            item.Domain,
+                            item.Path,
+                            (
+                                None
+                                if item.IsSession
+                                else (
+                                    item.Expires.ToUniversalTime() - epoch
+                                ).TotalSeconds
+                            ),
+                            item.IsSecure,
+                            item.IsHttpOnly,
+                        )
+                        for item in task.Result
+                    ],
+                    False,
+                )
+
+            self.gui.browser.web_view.CoreWebView2.CookieManager.GetCookiesAsync(
+                url or ""
+            ).ContinueWith(
+                Action[Task](on_cookies),
+                TaskScheduler.FromCurrentSynchronizationContext(),
             )
 
-        def handle_web_message(self, message_type, data):
-            self.handle_ipc(message_type, data)
+    class IPCHandler(Gui.IPCHandler):
+        def initialize(self):
+            def callback(result, is_exc):
+                self.bridge_initialized(result, is_exc)
+                self.gui.window.navigated.set(str(self.gui.browser.web_view.Source))
+
+            self.evaluate_js(self.bridge_script(), callback)
+
+        @invoke_in_gui
+        def post_message(self, message):
+            self.gui.browser.web_view.CoreWebView2.PostWebMessageAsString(message)
+
+        @invoke_in_gui
+        def post_json(self, message):
+            self.gui.browser.web_view.CoreWebView2.PostWebMessageAsJson(message)
 
         @invoke_in_gui
         def evaluate_js(self, script, callback=None):
@@ -97,13 +176,7 @@ class WpfGui:
                 if callback:
                     callback(e, True)
 
-    class NavigateHandler:
-        def __init__(self, gui):
-            self.gui = gui
-
-        def invoke(self, func):
-            return self.gui.invoke(func)
-
+    class NavigateHandler(Gui.NavigateHandler):
         @invoke_in_gui
         def navigate_to(self, url):
             self.gui.browser.web_view.Source = Uri(url)
@@ -122,10 +195,18 @@ class WpfGui:
         maximized=False,
         minimized=False,
         xaml=None,
-        xaml_path=str(lib_path / "Main.xaml"),
+        xaml_path=default_xaml_path,
+        group=None,
     ):
         # self.window = window
         self.window = None
+        self.group = group
+        self.dispatcher = None
+        self.mirror = StateMirror()
+        self._batching = False
+        self._open_kind = None
+        self._open_started = None
+        self.asset_servers = []
 
         if not frameless and transparent:
             print("Transparent window must be frameless")
@@ -190,83 +271,210 @@ class WpfGui:
 
         # self.instances.append(self.window)
 
+    def _sync_state(self, *args):
+        if self._batching:
+            return
+
+        self.mirror.update(
+            title=self.gui_window.Title,
+            size=(self.gui_window.Width, self.gui_window.Height),
+            position=(self.gui_window.Left, self.gui_window.Top),
+            resizable=self.gui_window.ResizeMode != ResizeMode.NoResize,
+            frameless=self.gui_window.WindowStyle == getattr(WindowStyle, "None"),
+            transparent=self.gui_window.AllowsTransparency,
+            background=self.gui_window.Background,
+            topmost=self.gui_window.Topmost,
+            visible=self.gui_window.IsVisible,
+            state=str(self.gui_window.WindowState).lower(),
+        )
+
+    def add_asset_server(self, server):
+        if self.window is None:
+            self.asset_servers.append(server)
+            return
+
+        def add():
+            self.asset_servers.append(server)
+
+            if self.browser.web_view.CoreWebView2 is not None:
+                self.browser.serve(server)
+
+        self.invoke_nowait(add)
+
     def _on_shown(self, sender, args):
         if sender.IsVisible:
             self.window.shown.set()
 
     def _on_closed(self, sender, args):
         self.instances.remove(self.window)
+        self.window.ipc.handle_reset("closed")
         self.window.closed.set()
 
+        if not self.instances:
+            self.app.Dispatcher.BeginInvoke(Action(self._shutdown))
+
+        if self.group is not None and not any(
+            window.gui.group == self.group for window in self.instances
+        ):
+            del self.dispatchers[self.group]
+            self.dispatcher.InvokeShutdown()
+
     def _on_closing(self, sender, args):
         self.window.closing.set()
 
     @classmethod
-    def create(
-        cls,
-        title,
-        size=None,
-        position=None,
-        resizable=True,
-        frameless=False,
-        transparent=False,
-        background=None,
-        topmost=False,
-        hidden=False,
-        maximized=False,
-        minimized=False,
-        xaml=None,
-        xaml_path=str(lib_path / "Main.xaml"),
-    ):
-        gui = cls(
-            title=title,
-            size=size,
-            position=position,
-            resizable=resizable,
-            frameless=frameless,
-            transparent=transparent,
-            background=background,
-            topmost=topmost,
-            hidden=hidden,
-            maximized=maximized,
-            minimized=minimized,
-            xaml=xaml,
-            xaml_path=xaml_path,
+    async def start(cls, *windows):
+        await initialize_gui(*windows)
+
+    @classmethod
+    async def start_dispatcher(cls, group):
+        if group in cls.dispatchers:
+            return cls.dispatchers[group]
+
+        if group not in cls.starting:
+            started = cls.starting[group] = Event()
+
+            def run():
+                started.set(Dispatcher.CurrentDispatcher)
+                Dispatcher.Run()
+
+            thread = Thread(ThreadStart(run))
+            thread.SetApartmentState(ApartmentState.STA)
+            thread.IsBackground = True
+            thread.Start()
+
+        (dispatcher,) = await cls.starting[group].wait()
+        cls.dispatchers.setdefault(group, dispatcher)
+        cls.starting.pop(group, None)
+        return dispatcher
+
+    @classmethod
+    def parse_template(cls, xaml_path=None, xaml=None):
+        key = xaml_path or xaml
+
+        if key not in cls.templates:
+            if xaml_path:
+                with open(lib_path / xaml_path, encoding="utf-8") as f:
+                    xaml = f.read()
+
+            reader = XamlXmlReader(
+                XmlReader.Create(StringReader(xaml)), XamlReader.GetWpfSchemaContext()
+            )
+            nodes = XamlNodeList(reader.SchemaContext)
+            XamlServices.Transform(reader, nodes.Writer)
+            cls.templates[key] = nodes
+
+        return cls.templates[key]
+
+    @classmethod
+    def load_template(cls, xaml_path=None, xaml=None):
+        return XamlReader.Load(cls.parse_template(xaml_path, xaml).GetReader())
+
+    @classmethod
+    def prewarm(cls, size):
+        cls.pool_size = size
+
+        if cls.app:
+            cls._schedule_fill()
+
+    @classmethod
+    def _schedule_fill(cls):
+        cls.app.Dispatcher.BeginInvoke(
+            DispatcherPriority.ApplicationIdle, Action(cls._fill_pool)
         )
-        return (
-            gui,
-            cls.CookieManager(gui),
-            cls.IPCHandler(gui),
-            cls.NavigateHandler(gui),
+
+    @classmethod
+    @try_except
+    def _fill_pool(cls):
+        if len(cls.pool) >= cls.pool_size:
+            return
+
+        gui_window = cls.load_template(default_xaml_path)
+        gui_window.ShowInTaskbar = False
+        gui_window.ShowActivated = False
+        gui_window.WindowStartupLocation = WindowStartupLocation.Manual
+        gui_window.Left = gui_window.Top = -32000
+        gui_window.Show()
+
+        browser = Edge(gui_window)
+        browser.web_view.EnsureCoreWebView2Async(None)
+
+        cls.pool.append((gui_window, browser))
+        cls._schedule_fill()
+
+    @classmethod
+    def _drain_pool(cls):
+        cls.pool_size = 0
+
+        for gui_window, browser in cls.pool:
+            gui_window.Close()
+
+        cls.pool.clear()
+
+    @classmethod
+    def _shutdown(cls):
+        if cls.instances:
+            return
+
+        cls._drain_pool()
+        cls.app.Shutdown()
+
+    def _claim_warm(self):
+        if (
+            self.pool
+            and self.group is None
+            and self._xaml_path == default_xaml_path
+            and not self._transparent
+        ):
+            return self.pool.pop(0)
+
+    def _center(self):
+        area = SystemParameters.WorkArea
+        self.move_abs(
+            area.Left + (area.Width - self.gui_window.Width) / 2,
+            area.Top + (area.Height - self.gui_window.Height) / 2,
         )
 
     def initialize(self, window):
+        started = time.perf_counter()
         self.window = window
 
-        self.gui_window = (
-            XamlReader.Load(StreamReader(str(lib_path / self._xaml_path)).BaseStream)
-            if self._xaml_path
-            else XamlReader.Parse(self._xaml)
-        )
+        warm = self._claim_warm()
+        if warm:
+            self.gui_window, self.browser = warm
+            self.gui_window.ShowInTaskbar = True
+            self.gui_window.ShowActivated = True
+        else:
+            self.gui_window = self.load_template(self._xaml_path, self._xaml)
 
-        self.title = self._title
+        self._sync_state()
+        self.gui_window.LocationChanged += self._sync_state
+        self.gui_window.SizeChanged += self._sync_state
+        self.gui_window.StateChanged += self._sync_state
+        self.gui_window.IsVisibleChanged += self._sync_state
 
-        if self._size:
-            self.size = self._size
+        with self.batch() as batch:
+            batch.title = self._title
 
-        if self._position:
-            self.position = self._position
-        else:
-            self.gui_window.WindowStartupLocation = WindowStartupLocation.CenterScreen
+            if self._size:
+                batch.size = self._size
+
+            if self._position:
+                batch.position = self._position
 
-        self.resizable = self._resizable
-        self.frameless = self._frameless or self._transparent
-        self.transparent = self._transparent
+            batch.resizable = self._resizable
+            batch.frameless = self._frameless or self._transparent
+            batch.transparent = self._transparent
 
-        if self._background:
-            self.background = self._background
+            if self._background:
+                batch.background = self._background
 
-        self.topmost = self._topmost
+            batch.topmost = self._topmost
+
+        if warm and not self._position:
+            self._center()
+        elif not self._position:
+            self.gui_window.WindowStartupLocation = WindowStartupLocation.CenterScreen
 
         if self._hidden:
             self.hide()
@@ -279,39 +487,80 @@ class WpfGui:
 
         self.handle = int(Interop.WindowInteropHelper(self.gui_window).Handle.ToInt64())
 
-        self.browser = Edge(self.gui_window, self.window)
+        if not warm:
+            self.browser = Edge(self.gui_window)
+
+        self._open_kind = "warm" if warm else "cold"
+        self._open_started = started
+        self.browser.attach(self.window)
 
         self.gui_window.IsVisibleChanged += self._on_shown
         self.gui_window.Closed += self._on_closed
         self.gui_window.Closing += self._on_closing
 
+        if self.gui_window.IsVisible:
+            self.window.shown.set()
+
         self.instances.append(self.window)
 
+        if warm:
+            self._schedule_fill()
+
+    def _browser_ready(self):
+        if self._open_started is not None:
+            self.record_open(self._open_kind, time.perf_counter() - self._open_started)
+            self._open_started = None
+
     def begin_invoke(self, func):
-        return self.gui_window.Dispatcher.BeginInvoke(Func[Type](func))
+        return self.dispatcher.BeginInvoke(Func[Type](func))
 
     def invoke(self, func):
-        return self.gui_window.Dispatcher.Invoke(Func[Type](func))
+        if self.dispatcher.CheckAccess():
+            return func()
+
+        if self.metrics is None:
+            return self.dispatcher.Invoke(Func[Type](func))
+
+        started = time.perf_counter()
+        try:
+            return self.dispatcher.Invoke(Func[Type](func))
+        finally:
+            self.metrics.since("dispatcher.invoke.ms", started)
+
+    def apply(self, changes):
+        self._batching = True
+        disabled = self.gui_window.Dispatcher.DisableProcessing()
+
+        try:
+            super().apply(changes)
+
+        finally:
+            disabled.Dispose()
+            self._batching = False
+
+        self._sync_state()
 
     # title
     @property
     def title(self):
-        return self.gui_window.Title
+        return self.mirror["title"]
 
     @title.setter
     @invoke_in_gui
     def title(self, title):
         self.gui_window.Title = title
+        self._sync_state()
 
     # size
     @invoke_in_gui
     def resize(self, width, height):
         self.gui_window.Width = width
         self.gui_window.Height = height
+        self._sync_state()
 
     @property
     def size(self):
-        return self.gui_window.Width, self.gui_window.Height
+        return self.mirror["size"]
 
     @size.setter
     def size(self, size):
@@ -322,15 +571,17 @@ class WpfGui:
     def move(self, dx, dy):
         self.gui_window.Left += dx
         self.gui_window.Top += dy
+        self._sync_state()
 
     @invoke_in_gui
     def move_abs(self, x, y):
         self.gui_window.Left = x
         self.gui_window.Top = y
+        self._sync_state()
 
     @property
     def position(self):
-        return self.gui_window.Left, self.gui_window.Top
+        return self.mirror["position"]
 
     @position.setter
     def position(self, position):
@@ -339,7 +590,7 @@ class WpfGui:
     # resizable
     @property
     def resizable(self):
-        return not self.gui_window.ResizeMode == ResizeMode.NoResize
+        return self.mirror["resizable"]
 
     @resizable.setter
     @invoke_in_gui
@@ -347,11 +598,12 @@ class WpfGui:
         self.gui_window.ResizeMode = (
             ResizeMode.CanResize if resizable else ResizeMode.NoResize
         )
+        self._sync_state()
 
     # frameless
     @property
     def frameless(self):
-        return self.gui_window.WindowStyle == getattr(WindowStyle, "None")
+        return self.mirror["frameless"]
 
     @frameless.setter
     @invoke_in_gui
@@ -374,10 +626,12 @@ class WpfGui:
             WindowChrome.SetWindowChrome(self.gui_window, None)
             self.gui_window.FindName("Grid").Margin = Thickness(0.0)
 
+        self._sync_state()
+
     # transparent
     @property
     def transparent(self):
-        return self.gui_window.AllowsTransparency
+        return self.mirror["transparent"]
 
     @transparent.setter
     @invoke_in_gui
@@ -385,25 +639,33 @@ class WpfGui:
         if not self.window.shown.is_set():
             self.gui_window.AllowsTransparency = transparent
 
+        self._sync_state()
+
     # background
     @property
     def background(self):
-        return self.gui_window.Background
+        return self.mirror["background"]
 
     @background.setter
     @invoke_in_gui
     def background(self, background):
         self.gui_window.Background = BrushConverter().ConvertFrom(background)
+        self._sync_state()
 
     # topmost
     @property
     def topmost(self):
-        return self.gui_window.Topmost
+        return self.mirror["topmost"]
 
     @topmost.setter
     @invoke_in_gui
     def topmost(self, topmost):
         self.gui_window.Topmost = topmost
+        self._sync_state()
+
+    @property
+    def visible(self):
+        return self.mirror["visible"]
 
     @invoke_in_gui
     def show(self):
@@ -436,31 +698,108 @@ class WpfGui:
 
 class Edge:
     @try_except
-    def __init__(self, gui_window, window):
+    def __init__(self, gui_window):
         self.gui_window = gui_window
-        self.window = window
+        self.window = None
 
         self.web_view = WebView2()
         self.web_view.DefaultBackgroundColor = Color.Transparent
 
+        self.gui_window.FindName("Grid").Children.Add(self.web_view)
+
+    @try_except
+    def attach(self, window):
+        self.window = window
+
         self.web_view.CoreWebView2InitializationCompleted += self._on_ready
+        self.web_view.NavigationStarting += self._on_navigation_starting
         self.web_view.NavigationCompleted += self._on_navigation_completed
         self.web_view.WebMessageReceived += self._on_web_message
-        self.web_view.Source = Uri(self.window.url)
 
-        self.gui_window.FindName("Grid").Children.Add(self.web_view)
+        if self.web_view.CoreWebView2 is not None:
+            self._on_ready(self.web_view, None)
+
+        self.web_view.Source = Uri(self.window.url)
 
     def _on_web_message(self, sender, args):
-        self.window.ipc.handle_web_message(*json.loads(args.WebMessageAsJson))
+        received = time.perf_counter()
+        message = args.WebMessageAsJson
+
+        if message.startswith('"'):
+            self.window.ipc.handle_web_message(
+                args.TryGetWebMessageAsString(), received, len(message)
+            )
+        else:
+            self.window.ipc.handle_web_message(
+                json.loads(message), received, len(message)
+            )
 
     def _on_ready(self, sender, args):
+        self.web_view.CoreWebView2.AddScriptToExecuteOnDocumentCreatedAsync(
+            self.window.ipc.preload_script()
+        )
         self.web_view.CoreWebView2.NewWindowRequested += self._on_new_window_requested
+        self.web_view.CoreWebView2.WebResourceRequested += (
+            self._on_web_resource_requested
+        )
+
+        for server in self.window.gui.asset_servers:
+            self.serve(server)
+
+        self.window.gui._browser_ready()
         self.window.ready.set()
 
+    def serve(self, server):
+        self.web_view.CoreWebView2.AddWebResourceRequestedFilter(
+            f"{server.origin}/*", CoreWebView2WebResourceContext.All
+        )
+
+    def _on_web_resource_requested(self, sender, args):
+        url = args.Request.Uri
+        server = next(
+            (server for server in self.window.gui.asset_servers if server.matches(url)),
+            None,
+        )
+
+        if server is None:
+            return
+
+        method = args.Request.Method
+        headers = {header.Key: header.Value for header in args.Request.Headers}
+        deferral = args.GetDeferral()
+
+        def respond(response):
+            try:
+                args.Response = (
+                    self.web_view.CoreWebView2.Environment.CreateWebResourceResponse(
+                        MemoryStream(response.body),
+                        response.status,
+                        response.reason,
+                        response.header_text(),
+                    )
+                )
+            finally:
+                deferral.Complete()
+
+        def handle():
+            try:
+                response = server.handle(method, url, headers)
+            except Exception as e:
+                response = Response(
+                    500, {"Content-Type": "text/plain"}, str(e).encode()
+                )
+
+            self.window.gui.invoke_nowait(lambda: respond(response))
+
+        server.submit(handle)
+
     def _on_new_window_requested(self, sender, args):
         args.Handled = True
         self.window.new_window.set(args.Name, str(args.Uri))
 
+    def _on_navigation_starting(self, sender, args):
+        self.window.ipc.handle_reset("navigation")
+
     def _on_navigation_completed(self, sender, args):
         self.window.ipc.initialize()
 
@@ -479,27 +818,45 @@ class Edge:
 
 
 async def initialize_gui(*windows):
-    windows = list(windows)
+    loop = asyncio.get_running_loop()
+    templates = asyncio.gather(
+        *(
+            loop.run_in_executor(
+                get_pool(THREAD),
+                WpfGui.parse_template,
+                window.gui._xaml_path,
+                window.gui._xaml,
+            )
+            for window in windows
+        )
+    )
 
-    if not WpfGui.instances:
-        if not WpfGui.app_created:
-            WpfGui.app_created = Event()
+    if not WpfGui.app_created:
+        WpfGui.app_created = Event()
 
         @try_except
         def create():
-            master = windows.pop(0)
-            master.gui.initialize(master)
-
             WpfGui.app = Application()
+            WpfGui.app.ShutdownMode = ShutdownMode.OnExplicitShutdown
             WpfGui.app.Startup += lambda *_: WpfGui.app_created.set()
-            WpfGui.app.Run(master.gui.gui_window)
+            if WpfGui.pool_size:
+                WpfGui._schedule_fill()
+            WpfGui.app.Run()
 
         thread = Thread(ThreadStart(create))
         thread.SetApartmentState(ApartmentState.STA)
         thread.Start()
 
     await WpfGui.app_created.wait()
+    WpfGui.dispatchers.setdefault(None, WpfGui.app.Dispatcher)
 
-    master = WpfGui.instances[0]
     for window in windows:
-        master.gui.begin_invoke(lambda: window.gui.initialize(window))
+        window.gui.dispatcher = await WpfGui.start_dispatcher(window.gui.group)
+
+    await templates
+    await asyncio.gather(
+        *(
+            window.gui.invoke_async(partial(window.gui.initialize, window))
+            for window in windows
+        )
+    )
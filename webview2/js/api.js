@@ -1,21 +1,285 @@
-const webview = {
+var webview = window.webview || {
     api: new Proxy({}, {
         get(target, name) {
-            return (...args) => {
-                return new Promise((resolve, reject) => {
-                    const callId = webview._uuid();
-
-                    webview._promiseMap[callId] = {
-                        resolve,
-                        reject
-                    };
-                    chrome.webview.postMessage([0, [callId, name, args]]);
-                });
-            };
+            return (...args) => webview._call(name, args, webview._timeout);
         },
     }),
 
+    timeout(ms) {
+        return new Proxy({}, {
+            get(target, name) {
+                return (...args) => webview._call(name, args, ms);
+            },
+        });
+    },
+
     _promiseMap: {},
+    _pending: 0,
+    _generation: null,
+    _timeout: null,
+    _maxPending: null,
+    _installed: false,
+    _protocols: [2, 1],
+    _protocol: 1,
+    _nextId: 0,
+    _trace: false,
+    _spans: null,
+    _topics: {},
+    _states: {},
+    _prepared: {},
+
+    _init(config) {
+        if (config.generation !== null) {
+            if (webview._generation !== null && webview._generation !== config.generation) {
+                webview._rejectAll("CallCancelledError", "navigation");
+            }
+            webview._generation = config.generation;
+        }
+        webview._timeout = config.timeout;
+        webview._maxPending = config.maxPending;
+        webview._transferThreshold = config.transferThreshold ?? webview._transferThreshold;
+        webview._trace = !!config.trace;
+        webview._protocol = (config.protocols || [1]).find((version) => webview._protocols.includes(version)) || 1;
+        return webview._protocol;
+    },
+
+    _ready() {
+        webview._post(5, webview._protocol);
+    },
+
+    subscribe(topic, callback) {
+        const entry = webview._topic(topic);
+        entry.callbacks.add(callback);
+        if ("value" in entry) {
+            callback(entry.value, topic);
+        }
+        return () => entry.callbacks.delete(callback);
+    },
+
+    latest(topic) {
+        return webview._topic(topic).value;
+    },
+
+    _topic(topic) {
+        return webview._topics[topic] || (webview._topics[topic] = { callbacks: new Set() });
+    },
+
+    _publish(values, batch) {
+        const topics = Object.keys(values);
+        for (const topic of topics) {
+            const entry = webview._topic(topic);
+            entry.value = values[topic];
+            for (const callback of entry.callbacks) {
+                try {
+                    callback(entry.value, topic);
+                } catch (error) {
+                    console.error(error);
+                }
+            }
+        }
+        setTimeout(() => webview._post(7, batch));
+    },
+
+    state(name) {
+        return webview._states[name] || (webview._states[name] = {
+            value: undefined,
+            version: -1,
+            twoWay: false,
+            inflight: 0,
+            pending: null,
+            callbacks: new Set(),
+            subscribe(callback) {
+                this.callbacks.add(callback);
+                if (this.version >= 0) {
+                    callback(this.value, []);
+                }
+                return () => this.callbacks.delete(callback);
+            },
+            set(path, value) {
+                webview._stateEdit(name, { op: "add", path, value });
+            },
+            remove(path) {
+                webview._stateEdit(name, { op: "remove", path });
+            },
+        });
+    },
+
+    _stateApply(state, ops) {
+        for (const op of ops) {
+            const tokens = op.path.split("/").slice(1).map((token) => token.replace(/~1/g, "/").replace(/~0/g, "~"));
+            if (!tokens.length) {
+                state.value = op.value;
+                continue;
+            }
+            const key = tokens.pop();
+            const target = tokens.reduce((node, token) => node[token], state.value);
+            if (!Array.isArray(target)) {
+                if (op.op === "remove") {
+                    delete target[key];
+                } else {
+                    target[key] = op.value;
+                }
+            } else if (op.op === "add") {
+                target.splice(key === "-" ? target.length : Number(key), 0, op.value);
+            } else if (op.op === "replace") {
+                target[Number(key)] = op.value;
+            } else {
+                target.splice(Number(key), 1);
+            }
+        }
+        for (const callback of state.callbacks) {
+            try {
+                callback(state.value, ops);
+            } catch (error) {
+                console.error(error);
+            }
+        }
+    },
+
+    _stateReset(name, version, value, twoWay) {
+        const state = webview.state(name);
+        state.version = version;
+        state.twoWay = twoWay;
+        state.inflight = 0;
+        state.pending = null;
+        webview._stateApply(state, [{ op: "replace", path: "", value }]);
+    },
+
+    _statePatch(name, version, ops) {
+        const state = webview._states[name];
+        if (!state || state.version < 0 || version <= state.version) {
+            return;
+        }
+        if (version !== state.version + 1) {
+            webview._post(8, name, -1, "[]");
+            return;
+        }
+        state.version = version;
+        if (ops.length) {
+            webview._stateApply(state, ops);
+        } else if (state.inflight) {
+            state.inflight--;
+        }
+    },
+
+    _stateEdit(name, op) {
+        const state = webview.state(name);
+        if (!state.twoWay) {
+            throw new Error(`state ${name} is read-only`);
+        }
+        webview._stateApply(state, [op]);
+        if (!state.pending) {
+            state.pending = [];
+            setTimeout(() => {
+                const ops = state.pending;
+                state.pending = null;
+                if (ops) {
+                    webview._post(8, name, state.version + state.inflight++, `[${ops.join(",")}]`);
+                }
+            });
+        }
+        state.pending.push(JSON.stringify(op));
+    },
+
+    _setTrace(enabled) {
+        webview._trace = enabled;
+    },
+
+    _now() {
+        return performance.timeOrigin + performance.now();
+    },
+
+    _span(name, callId, origin, start) {
+        if (!webview._spans) {
+            webview._spans = [];
+            setTimeout(() => {
+                webview._post(6, JSON.stringify(webview._spans));
+                webview._spans = null;
+            });
+        }
+        webview._spans.push([name, callId, origin, start, webview._now() - start]);
+    },
+
+    _newId() {
+        return webview._protocol === 2 ? webview._nextId++ : webview._uuid();
+    },
+
+    _post(type, ...fields) {
+        chrome.webview.postMessage(webview._protocol === 2 ? [type, ...fields] : [type, fields]);
+    },
+
+    _errorJson(error) {
+        if (error instanceof Error) {
+            return { name: error.name, message: error.message, stack: error.stack };
+        }
+        return { name: "Error", message: String(error), stack: "" };
+    },
+
+    _postResult(callId, result, isError) {
+        result = isError ? webview._errorJson(result) : webview._encode(result);
+        if (webview._protocol === 2) {
+            webview._post(1, callId, isError, result);
+        } else {
+            webview._post(1, callId, JSON.stringify(result), isError);
+        }
+    },
+
+    _rejectAll(name, message) {
+        for (const callId of Object.keys(webview._promiseMap)) {
+            webview._settle(callId).reject(webview._error({ name, message }));
+        }
+        for (const streamId of Object.keys(webview._streams)) {
+            webview._streamEnd(streamId, { name, message });
+        }
+        webview._transfers = {};
+    },
+
+    _call(name, args, timeout) {
+        return webview._iterable(new Promise((resolve, reject) => {
+            if (webview._maxPending && webview._pending >= webview._maxPending) {
+                reject(webview._error({
+                    name: "TooManyCallsError",
+                    message: `more than ${webview._maxPending} pending calls`,
+                }));
+                return;
+            }
+
+            const callId = webview._newId();
+            const entry = webview._promiseMap[callId] = {
+                resolve,
+                reject,
+                timer: null,
+            };
+            if (timeout) {
+                entry.timer = setTimeout(() => {
+                    webview._settle(callId);
+                    reject(webview._error({
+                        name: "TimeoutError",
+                        message: `${name} timed out after ${timeout} ms`,
+                    }));
+                }, timeout);
+            }
+            webview._pending++;
+            if (webview._trace) {
+                entry.name = name;
+                entry.started = webview._now();
+            }
+            webview._post(0, callId, name, webview._encode(args));
+            if (entry.started) {
+                webview._span("js.post", callId, "js", entry.started);
+            }
+        }));
+    },
+
+    _settle(callId) {
+        const entry = webview._promiseMap[callId];
+        if (entry) {
+            clearTimeout(entry.timer);
+            delete webview._promiseMap[callId];
+            webview._pending--;
+        }
+        return entry;
+    },
 
     _uuid() {
         const temp_url = URL.createObjectURL(new Blob());
@@ -25,22 +289,305 @@ const webview = {
     },
 
     _callJs(callId, func) {
+        const started = webview._trace && webview._now();
         func()
-            .then((result) => chrome.webview.postMessage([1, [callId, JSON.stringify(result), false]]))
-            .catch((error) => chrome.webview.postMessage([1, [callId, JSON.stringify(error), true]]));
+            .then((result) => webview._postResult(callId, result, false))
+            .catch((error) => webview._postResult(callId, error, true))
+            .finally(() => started && webview._span("js.run", callId, "python", started));
+    },
+
+    _preparedEntry(handle) {
+        let entry = webview._prepared[handle];
+        if (!entry) {
+            entry = webview._prepared[handle] = { func: null };
+            entry.promise = new Promise((resolve) => (entry.resolve = resolve));
+        }
+        return entry;
+    },
+
+    _prepare(handle, func) {
+        const entry = webview._preparedEntry(handle);
+        entry.func = func;
+        entry.resolve(func);
+    },
+
+    _checkPrepared(handle) {
+        if (!webview._preparedEntry(handle).func) {
+            const error = new SyntaxError(`prepared function ${handle} failed to register`);
+            webview._prepare(handle, () => {
+                throw error;
+            });
+        }
+    },
+
+    _unprepare(handle) {
+        webview._prepare(handle, () => {
+            throw new Error(`prepared function ${handle} was released`);
+        });
+    },
+
+    _invoke(callId, handle, args, hasBinary) {
+        webview._callJs(callId, async () => {
+            const entry = webview._preparedEntry(handle);
+            const func = entry.func || (await entry.promise);
+            return func(...(hasBinary ? await webview._decode(args) : args));
+        });
+    },
+
+    _resultQueue: null,
+
+    _queueResult(callId, result, isError) {
+        if (!webview._resultQueue) {
+            webview._resultQueue = [];
+            setTimeout(() => {
+                webview._post(2, ...webview._resultQueue);
+                webview._resultQueue = null;
+            });
+        }
+        result = isError ? webview._errorJson(result) : webview._encode(result);
+        if (webview._protocol === 2) {
+            webview._resultQueue.push(callId, isError, result);
+        } else {
+            webview._resultQueue.push([callId, JSON.stringify(result), isError]);
+        }
+    },
+
+    _AsyncFunction: Object.getPrototypeOf(async () => {}).constructor,
+
+    _callJsBatch(calls) {
+        for (const [callId, source] of calls) {
+            const started = webview._trace && webview._now();
+            new Promise((resolve) => resolve(new webview._AsyncFunction(source)()))
+                .then((result) => webview._queueResult(callId, result, false))
+                .catch((error) => webview._queueResult(callId, error, true))
+                .finally(() => started && webview._span("js.run", callId, "python", started));
+        }
+    },
+
+    _transferThreshold: 64 * 1024,
+    _chunkSize: 512 * 1024,
+    _transferId: 0,
+    _transfers: {},
+
+    _toBase64(bytes) {
+        if (bytes.toBase64) {
+            return bytes.toBase64();
+        }
+        let binary = "";
+        for (let i = 0; i < bytes.length; i += 0x8000) {
+            binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+        }
+        return btoa(binary);
+    },
+
+    _fromBase64(data) {
+        if (Uint8Array.fromBase64) {
+            return Uint8Array.fromBase64(data);
+        }
+        const binary = atob(data);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return bytes;
+    },
+
+    _encodeBytes(bytes) {
+        if (bytes.length <= webview._transferThreshold) {
+            return { $bytes: webview._toBase64(bytes) };
+        }
+        const transferId = `js-${webview._transferId++}`;
+        const total = Math.ceil(bytes.length / webview._chunkSize);
+        for (let index = 0; index < total; index++) {
+            const chunk = bytes.subarray(index * webview._chunkSize, (index + 1) * webview._chunkSize);
+            chrome.webview.postMessage(`${transferId}:${index}:${total}:${webview._toBase64(chunk)}`);
+        }
+        return { $transfer: transferId, size: bytes.length };
+    },
+
+    _encode(value) {
+        if (value instanceof ArrayBuffer) {
+            return webview._encodeBytes(new Uint8Array(value));
+        }
+        if (ArrayBuffer.isView(value)) {
+            return webview._encodeBytes(new Uint8Array(value.buffer, value.byteOffset, value.byteLength));
+        }
+        if (Array.isArray(value)) {
+            return value.map(webview._encode);
+        }
+        if (value && typeof value === "object" && value.constructor === Object) {
+            return Object.fromEntries(Object.entries(value).map(([key, item]) => [key, webview._encode(item)]));
+        }
+        return value;
+    },
+
+    _transfer(transferId) {
+        let transfer = webview._transfers[transferId];
+        if (!transfer) {
+            transfer = webview._transfers[transferId] = { chunks: {}, received: 0 };
+            transfer.promise = new Promise((resolve) => (transfer.resolve = resolve));
+        }
+        return transfer;
+    },
+
+    _onChunk(message) {
+        const [header, transferId, index, total] = message.match(/^([^:]*):(\d+):(\d+):/);
+        const transfer = webview._transfer(transferId);
+        transfer.chunks[index] = webview._fromBase64(message.substring(header.length));
+
+        if (++transfer.received == total) {
+            const chunks = Array.from({ length: total }, (_, i) => transfer.chunks[i]);
+            const bytes = new Uint8Array(chunks.reduce((size, chunk) => size + chunk.length, 0));
+            let offset = 0;
+            for (const chunk of chunks) {
+                bytes.set(chunk, offset);
+                offset += chunk.length;
+            }
+            transfer.resolve(bytes);
+        }
+    },
+
+    async _decode(value) {
+        if (Array.isArray(value)) {
+            return Promise.all(value.map(webview._decode));
+        }
+        if (value && typeof value === "object") {
+            if ("$bytes" in value) {
+                return webview._fromBase64(value.$bytes);
+            }
+            if ("$transfer" in value) {
+                const bytes = await webview._transfer(value.$transfer).promise;
+                delete webview._transfers[value.$transfer];
+                return bytes;
+            }
+            const entries = await Promise.all(
+                Object.entries(value).map(async ([key, item]) => [key, await webview._decode(item)])
+            );
+            return Object.fromEntries(entries);
+        }
+        return value;
+    },
+
+    _error(result) {
+        const error = new Error(result.message);
+        error.name = result.name;
+        if (result.stack) {
+            error.stack = result.stack;
+        }
+        return error;
     },
 
     _resultOk(callId, result, isError) {
-        const promise = this._promiseMap[callId];
+        const received = webview._trace && webview._now();
+        const promise = webview._settle(callId);
+        if (!promise) {
+            return;
+        }
         if (isError) {
-            const error = new Error(result.message);
-            error.name = result.name;
-            error.stack = result.stack;
-            promise.reject(error);
+            promise.reject(webview._error(result));
+        } else if (result && result.$stream !== undefined) {
+            promise.resolve(webview._stream(result.$stream));
         } else {
             promise.resolve(result);
         }
-        delete this._promiseMap[callId];
+        if (received && promise.started) {
+            webview._span("js.resultOk", callId, "js", received);
+            webview._span(`js.call ${promise.name}`, callId, "js", promise.started);
+        }
+    },
+
+    _streamCredit: 16,
+    _streams: {},
+
+    _iterable(promise) {
+        promise[Symbol.asyncIterator] = () => {
+            let iterator = null;
+            return {
+                async next() {
+                    iterator = iterator || (await promise)[Symbol.asyncIterator]();
+                    return iterator.next();
+                },
+                async return() {
+                    iterator = iterator || (await promise)[Symbol.asyncIterator]();
+                    return iterator.return();
+                },
+            };
+        };
+        return promise;
+    },
+
+    _stream(streamId) {
+        const stream = webview._streams[streamId] = {
+            items: [],
+            waiters: [],
+            consumed: 0,
+            done: false,
+            error: null,
+        };
+        return {
+            [Symbol.asyncIterator]() {
+                return this;
+            },
+            next() {
+                if (stream.items.length) {
+                    webview._consume(streamId, stream);
+                    return Promise.resolve({ value: stream.items.shift(), done: false });
+                }
+                if (stream.error) {
+                    return Promise.reject(stream.error);
+                }
+                if (stream.done) {
+                    return Promise.resolve({ value: undefined, done: true });
+                }
+                return new Promise((resolve, reject) => stream.waiters.push({ resolve, reject }));
+            },
+            return() {
+                if (!stream.done) {
+                    stream.done = true;
+                    delete webview._streams[streamId];
+                    webview._post(4, streamId, "cancel", 0);
+                }
+                return Promise.resolve({ value: undefined, done: true });
+            },
+        };
+    },
+
+    _consume(streamId, stream) {
+        if (++stream.consumed >= webview._streamCredit / 2) {
+            webview._post(4, streamId, "credit", stream.consumed);
+            stream.consumed = 0;
+        }
+    },
+
+    _streamItem(streamId, value) {
+        const stream = webview._streams[streamId];
+        if (!stream) {
+            return;
+        }
+        const waiter = stream.waiters.shift();
+        if (waiter) {
+            webview._consume(streamId, stream);
+            waiter.resolve({ value, done: false });
+        } else {
+            stream.items.push(value);
+        }
+    },
+
+    _streamEnd(streamId, error) {
+        const stream = webview._streams[streamId];
+        if (!stream) {
+            return;
+        }
+        stream.done = true;
+        stream.error = error && webview._error(error);
+        delete webview._streams[streamId];
+        for (const waiter of stream.waiters.splice(0)) {
+            if (stream.error) {
+                waiter.reject(stream.error);
+            } else {
+                waiter.resolve({ value: undefined, done: true });
+            }
+        }
     },
 
     _fetchJs(url) {
@@ -52,4 +599,14 @@ const webview = {
         });
     },
 };
-dispatchEvent(new CustomEvent("webviewready"));
\ No newline at end of file
+if (!webview._installed) {
+    webview._installed = true;
+    chrome.webview.addEventListener("message", (event) => {
+        if (typeof event.data === "string") {
+            webview._onChunk(event.data);
+        } else {
+            webview._invoke(...event.data);
+        }
+    });
+    dispatchEvent(new CustomEvent("webviewready"));
+}
\ No newline at end of file
@@ -0,0 +1,759 @@
+import ast
+import asyncio
+import json
+import queue
+import re
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from functools import partial
+from itertools import chain, count
+from threading import Timer
+from uuid import uuid4
+
+from webview2.assets import Response
+from webview2.backend import Gui
+from webview2.cookies import cookie, matches
+from webview2.error import JSError
+from webview2.protocol import (
+    CALL,
+    PUBLISHED,
+    READY,
+    RESULT,
+    RESULTS,
+    STATE,
+    STREAM,
+    TRACE,
+)
+from webview2.state import unescape
+from webview2.transfer import Transfer
+from webview2.utils import format_exception, invoke_in_gui, load_js_api, settle
+
+STREAM_CREDIT = 16
+
+init_pattern = re.compile(r"\s*webview\._init\((.*)\);\s*(webview\._ready\(\);)?\s*")
+call_pattern = re.compile(r"return ([\w.$]+)\((.*)\)", re.DOTALL)
+notify_pattern = re.compile(r"([\w.$]+)\((.*)\)", re.DOTALL)
+prepare_pattern = re.compile(r"webview\._prepare\((\d+), \(\n(.*)\n\)\)", re.DOTALL)
+decode_notify_pattern = re.compile(
+    r"webview\._decode\((.*)\)\.then\(\(args\) => ([\w.$]+)\(\.\.\.args\)\)",
+    re.DOTALL,
+)
+
+
+def parse_json(text):
+    if text.startswith("JSON.parse("):
+        text = ast.literal_eval(text[len("JSON.parse(") : -1])
+
+    return json.loads(text)
+
+
+def parse_args(text):
+    if text.startswith("..."):
+        return parse_json(text[3:])
+
+    return json.loads(f"[{text}]")
+
+
+class Dispatcher:
+    def __init__(self, name="loopback-dispatcher"):
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            func, future = self.queue.get()
+
+            try:
+                result = func()
+
+            except BaseException as e:
+                if future:
+                    future.set_exception(e)
+                else:
+                    traceback.print_exc()
+
+            else:
+                if future:
+                    future.set_result(result)
+
+    def begin_invoke(self, func):
+        self.queue.put((func, None))
+
+    def invoke(self, func):
+        if threading.current_thread() is self.thread:
+            return func()
+
+        future = Future()
+        self.queue.put((func, future))
+        return future.result()
+
+
+class PageStream:
+    end = object()
+
+    def __init__(self, page, stream_id):
+        self.page = page
+        self.stream_id = stream_id
+        self.items = queue.SimpleQueue()
+        self.consumed = 0
+
+    def __iter__(self):
+        while True:
+            item = self.items.get()
+
+            if item is self.end:
+                return
+
+            if isinstance(item, Exception):
+                raise item
+
+            self.consumed += 1
+            if self.consumed >= STREAM_CREDIT // 2:
+                self.page.post(STREAM, self.stream_id, "credit", self.consumed)
+                self.consumed = 0
+
+            yield item
+
+
+class PageApi:
+    def __init__(self, page):
+        self._page = page
+
+    def __getattr__(self, name):
+        return lambda *args: self._page.call_python(name, args)
+
+
+class Page:
+    def __init__(self, gui):
+        self.gui = gui
+        self.installed = False
+        self.transfer = Transfer(prefix="js")
+        self.promises = {}
+        self.streams = {}
+        self.generation = None
+        self.timeout = None
+        self.max_pending = None
+        self.protocol = 1
+        self.trace = False
+        self.spans = None
+        self.started = {}
+        self.topics = {}
+        self.subscribers = {}
+        self.states = {}
+        self.prepared = {}
+        self.api = PageApi(self)
+        self._ids = count()
+        self.bridge = {
+            "webview._resultOk": self.result_ok,
+            "webview._streamItem": self.stream_item,
+            "webview._streamEnd": self.stream_end,
+            "webview._fetchJs": lambda url: None,
+            "webview._setTrace": self.set_trace,
+            "webview._publish": self.publish,
+            "webview._stateReset": self.state_reset,
+            "webview._statePatch": self.state_patch,
+            "webview._unprepare": self.unprepare,
+            "webview._checkPrepared": self.check_prepared,
+        }
+
+    def post_message(self, message):
+        text = message if isinstance(message, str) else json.dumps(message)
+
+        if not isinstance(message, str):
+            message = json.loads(text)
+
+        self.gui.window.ipc.handle_web_message(message, size=len(text))
+
+    def post(self, message_type, *fields):
+        if self.protocol == 2:
+            self.post_message([message_type, *fields])
+        else:
+            self.post_message([message_type, list(fields)])
+
+    def on_message(self, message):
+        self.transfer.receive(message)
+
+    def on_json(self, message):
+        call_id, handle, args, has_binary = message
+        started = self.trace and self.now()
+
+        try:
+            if has_binary:
+                args = self.transfer.decode(args)
+
+            result = False, self.encode(self.prepared[handle](*args))
+
+        except Exception as e:
+            result = True, format_exception(e)
+
+        if started:
+            self.span("js.run", call_id, "python", started)
+
+        if self.protocol == 2:
+            self.post(RESULT, call_id, *result)
+        else:
+            self.post(RESULT, call_id, json.dumps(result[1]), result[0])
+
+    def prepare(self, handle, source):
+        func = self.gui.functions.get(source) or self.gui.scripts.get(source)
+
+        if func is None:
+            raise NameError(f"{source} is not defined")
+
+        self.prepared[handle] = func
+
+    def check_prepared(self, handle):
+        if handle not in self.prepared:
+
+            def fail(*args):
+                raise SyntaxError(f"prepared function {handle} failed to register")
+
+            self.prepared[handle] = fail
+
+    def unprepare(self, handle):
+        self.prepared.pop(handle, None)
+
+    def subscribe(self, topic, callback):
+        self.subscribers.setdefault(topic, []).append(callback)
+
+        if topic in self.topics:
+            callback(self.topics[topic], topic)
+
+    def publish(self, values, batch):
+        for topic, value in values.items():
+            self.topics[topic] = value
+
+            for callback in self.subscribers.get(topic, ()):
+                callback(value, topic)
+
+        self.gui.begin_invoke(lambda: self.post(PUBLISHED, batch))
+
+    def state_reset(self, name, version, value, two_way):
+        self.states[name] = {"version": version, "value": value, "inflight": 0}
+
+    def state_patch(self, name, version, ops):
+        state = self.states.get(name)
+
+        if state is None or version <= state["version"]:
+            return
+
+        if version != state["version"] + 1:
+            self.post(STATE, name, -1, "[]")
+            return
+
+        state["version"] = version
+
+        if not ops and state["inflight"]:
+            state["inflight"] -= 1
+
+        self.apply_state(state, ops)
+
+    def apply_state(self, state, ops):
+        for op in ops:
+            tokens = [unescape(token) for token in op["path"].split("/")[1:]]
+
+            if not tokens:
+                state["value"] = op["value"]
+                continue
+
+            target = state["value"]
+            for token in tokens[:-1]:
+                target = target[int(token) if isinstance(target, list) else token]
+
+            key = tokens[-1]
+
+            if isinstance(target, list):
+                if op["op"] == "add":
+                    target.insert(len(target) if key == "-" else int(key), op["value"])
+                elif op["op"] == "replace":
+                    target[int(key)] = op["value"]
+                else:
+                    del target[int(key)]
+
+            elif op["op"] == "remove":
+                del target[key]
+
+            else:
+                target[key] = op["value"]
+
+    def edit_state(self, name, ops):
+        state = self.states[name]
+        self.apply_state(state, ops)
+        self.post(STATE, name, state["version"] + state["inflight"], json.dumps(ops))
+        state["inflight"] += 1
+
+    def set_trace(self, enabled):
+        self.trace = enabled
+
+    def now(self):
+        return time.time() * 1000
+
+    def span(self, name, call_id, origin, start):
+        if self.spans is None:
+            self.spans = []
+            self.gui.begin_invoke(self.flush_spans)
+
+        self.spans.append([name, call_id, origin, start, self.now() - start])
+
+    def flush_spans(self):
+        spans, self.spans = self.spans, None
+        self.post(TRACE, json.dumps(spans))
+
+    def fetch(self, url, method="GET", headers=None):
+        for server in self.gui.asset_servers:
+            if server.matches(url):
+                return server.handle(method, url, headers)
+
+        return Response(404)
+
+    def encode(self, value):
+        return self.transfer.encode(value, self.post_message)[0]
+
+    def run(self, script):
+        js_api = load_js_api()
+
+        if script.startswith(js_api):
+            match = init_pattern.fullmatch(script, len(js_api))
+            protocol = self.install(json.loads(match[1]))
+
+            if match[2]:
+                self.post(READY, protocol)
+
+            return protocol
+
+        if script in self.gui.scripts:
+            return self.gui.scripts[script]()
+
+        match = prepare_pattern.fullmatch(script)
+        if match:
+            return self.prepare(int(match[1]), match[2])
+
+        match = decode_notify_pattern.fullmatch(script)
+        if match:
+            return self.invoke(match[2], self.transfer.decode(parse_json(match[1])))
+
+        match = notify_pattern.fullmatch(script)
+        if match:
+            return self.invoke(match[1], parse_args(match[2]))
+
+        raise SyntaxError(script)
+
+    def install(self, config):
+        if config["generation"] is not None:
+            if self.generation is not None and self.generation != config["generation"]:
+                self.reject_all("CallCancelledError", "navigation")
+
+            self.generation = config["generation"]
+
+        self.installed = True
+        self.timeout = config["timeout"]
+        self.max_pending = config["maxPending"]
+        self.transfer.threshold = config["transferThreshold"]
+        self.trace = bool(config.get("trace"))
+        self.protocol = next(
+            (version for version in config["protocols"] if version in (1, 2)), 1
+        )
+        return self.protocol
+
+    def reject_all(self, name, message):
+        error = {"name": name, "message": message, "stack": ""}
+
+        for future in self.promises.values():
+            settle(future, exception=JSError(error))
+
+        for stream in self.streams.values():
+            stream.items.put(JSError(error))
+
+        self.promises.clear()
+        self.streams.clear()
+
+    def invoke(self, name, args):
+        func = self.bridge.get(name) or self.gui.functions.get(name)
+
+        if func is None:
+            raise NameError(f"{name} is not defined")
+
+        return func(*args)
+
+    def evaluate(self, body):
+        if body in self.gui.scripts:
+            return self.gui.scripts[body]()
+
+        name, args = call_pattern.fullmatch(body).groups()
+
+        if args.startswith("...(await webview._decode("):
+            args = self.transfer.decode(
+                parse_json(args[len("...(await webview._decode(") : -len("))")])
+            )
+        else:
+            args = parse_args(args)
+
+        return self.invoke(name, args)
+
+    def call_js(self, calls):
+        results = []
+
+        for call_id, body in calls:
+            started = self.trace and self.now()
+
+            try:
+                result = self.evaluate(body)
+
+                if isinstance(result, Future):
+                    result.add_done_callback(partial(self.resolve_later, call_id))
+                    continue
+
+                results.append((call_id, False, self.encode(result)))
+
+            except Exception as e:
+                results.append((call_id, True, format_exception(e)))
+
+            if started:
+                self.span("js.run", call_id, "python", started)
+
+        if results:
+            self.post_results(results)
+
+    def resolve_later(self, call_id, future):
+        def post():
+            try:
+                result = call_id, False, self.encode(future.result())
+
+            except Exception as e:
+                result = call_id, True, format_exception(e)
+
+            self.post_results([result])
+
+        self.gui.begin_invoke(post)
+
+    def post_results(self, results):
+        if self.protocol == 2:
+            self.post(
+                RESULT if len(results) == 1 else RESULTS, *chain.from_iterable(results)
+            )
+            return
+
+        results = [
+            [call_id, json.dumps(result), is_error]
+            for call_id, is_error, result in results
+        ]
+        if len(results) == 1:
+            self.post(RESULT, *results[0])
+        else:
+            self.post(RESULTS, *results)
+
+    def call_python(self, name, args):
+        future = Future()
+
+        def post():
+            if self.max_pending and len(self.promises) >= self.max_pending:
+                settle(
+                    future,
+                    exception=JSError(
+                        {
+                            "name": "TooManyCallsError",
+                            "message": f"more than {self.max_pending} pending calls",
+                            "stack": "",
+                        }
+                    ),
+                )
+                return
+
+            call_id = next(self._ids) if self.protocol == 2 else uuid4().hex
+            self.promises[call_id] = future
+            if self.timeout:
+                Timer(
+                    self.timeout / 1000,
+                    self.gui.begin_invoke,
+                    [lambda: self.expire(call_id, name)],
+                ).start()
+
+            started = self.trace and self.now()
+            self.post(CALL, call_id, name, self.encode(list(args)))
+
+            if started:
+                self.started[call_id] = name, started
+                self.span("js.post", call_id, "js", started)
+
+        self.gui.begin_invoke(post)
+        return future
+
+    def expire(self, call_id, name):
+        future = self.promises.pop(call_id, None)
+
+        if future:
+            settle(
+                future,
+                exception=JSError(
+                    {
+                        "name": "TimeoutError",
+                        "message": f"{name} timed out after {self.timeout} ms",
+                        "stack": "",
+                    }
+                ),
+            )
+
+    def result_ok(self, call_id, result, is_error):
+        future = self.promises.pop(call_id, None)
+        name, started = self.started.pop(call_id, (None, None))
+
+        if future is None:
+            return
+
+        if started:
+            self.span(f"js.call {name}", call_id, "js", started)
+
+        if is_error:
+            settle(future, exception=JSError(result))
+        elif isinstance(result, dict) and "$stream" in result:
+            stream = self.streams[result["$stream"]] = PageStream(
+                self, result["$stream"]
+            )
+            settle(future, stream)
+        else:
+            settle(future, result)
+
+    def stream_item(self, stream_id, value):
+        if stream_id in self.streams:
+            self.streams[stream_id].items.put(value)
+
+    def stream_end(self, stream_id, error):
+        stream = self.streams.pop(stream_id, None)
+
+        if stream:
+            stream.items.put(JSError(error) if error else PageStream.end)
+
+
+def gui_property(name):
+    def fget(self):
+        return getattr(self, f"_{name}")
+
+    @invoke_in_gui
+    def fset(self, value):
+        setattr(self, f"_{name}", value)
+
+    return property(fget, fset)
+
+
+class LoopbackGui(Gui):
+    instances = []
+    dispatchers = {}
+    open_latencies = {}
+
+    class CookieManager(Gui.CookieManager):
+        @invoke_in_gui
+        def add_cookie(self, name, value, domain=None, path=None):
+            self.add_cookies([cookie(name, value, domain, path)])
+
+        @invoke_in_gui
+        def add_cookies(self, cookies):
+            for item in cookies:
+                self.gui.cookies[item["name"], item["domain"], item["path"]] = item
+
+        @invoke_in_gui
+        def delete_cookies(self, cookies=None):
+            if cookies is None:
+                self.gui.cookies.clear()
+                return
+
+            for item in cookies:
+                self.gui.cookies.pop((item["name"], item["domain"], item["path"]), None)
+
+        @invoke_in_gui
+        def get_cookies(self, url, callback):
+            callback(
+                [item for item in self.gui.cookies.values() if matches(item, url)],
+                False,
+            )
+
+    class IPCHandler(Gui.IPCHandler):
+        def initialize(self):
+            def callback(result, is_exc):
+                self.bridge_initialized(result, is_exc)
+                self.gui.window.navigated.set(self.gui.url)
+
+            self.evaluate_js(self.bridge_script(), callback)
+
+        @invoke_in_gui
+        def call_js(self, calls, callback=None):
+            self.gui.page.call_js(calls)
+
+            if callback:
+                callback(None, False)
+
+        @invoke_in_gui
+        def post_message(self, message):
+            self.gui.page.on_message(message)
+
+        @invoke_in_gui
+        def post_json(self, message):
+            self.gui.page.on_json(json.loads(message))
+
+        @invoke_in_gui
+        def evaluate_js(self, script, callback=None):
+            try:
+                result = self.gui.page.run(script)
+
+            except Exception as e:
+                if callback:
+                    callback(e, True)
+                else:
+                    traceback.print_exc()
+
+            else:
+                if callback:
+                    callback(result, False)
+
+    class NavigateHandler(Gui.NavigateHandler):
+        @invoke_in_gui
+        def navigate_to(self, url):
+            self.gui.navigate(url)
+
+    title = gui_property("title")
+    size = gui_property("size")
+    position = gui_property("position")
+    resizable = gui_property("resizable")
+    frameless = gui_property("frameless")
+    transparent = gui_property("transparent")
+    background = gui_property("background")
+    topmost = gui_property("topmost")
+
+    def __init__(
+        self,
+        title,
+        size=None,
+        position=None,
+        resizable=True,
+        frameless=False,
+        transparent=False,
+        background=None,
+        topmost=False,
+        hidden=False,
+        maximized=False,
+        minimized=False,
+        group=None,
+    ):
+        self.window = None
+        self.group = group
+        self.dispatcher = None
+        self.page = None
+        self.url = None
+        self.visible = False
+        self.state = "maximized" if maximized else "minimized" if minimized else None
+        self.functions = {}
+        self.scripts = {}
+        self.cookies = {}
+        self.asset_servers = []
+
+        self._title = title
+        self._size = size or (800, 600)
+        self._position = position or (0, 0)
+        self._resizable = resizable
+        self._frameless = frameless or transparent
+        self._transparent = transparent
+        self._background = background
+        self._topmost = topmost
+        self._hidden = hidden
+
+    @classmethod
+    async def start(cls, *windows):
+        for window in windows:
+            group = window.gui.group
+
+            if group not in cls.dispatchers:
+                cls.dispatchers[group] = Dispatcher(
+                    "loopback-dispatcher" if group is None else f"loopback-{group}"
+                )
+
+            window.gui.dispatcher = cls.dispatchers[group]
+
+        await asyncio.gather(
+            *(
+                window.gui.invoke_async(partial(window.gui.initialize, window))
+                for window in windows
+            )
+        )
+
+    def initialize(self, window):
+        started = time.perf_counter()
+        self.window = window
+        self.instances.append(self.window)
+
+        if not self._hidden:
+            self.show()
+
+        self.window.ready.set()
+        self.navigate(self.window.url)
+        self.record_open("cold", time.perf_counter() - started)
+
+    def add_asset_server(self, server):
+        self.asset_servers.append(server)
+
+    def navigate(self, url):
+        if self.page:
+            self.page.reject_all("CallCancelledError", "navigation")
+
+        self.window.ipc.handle_reset("navigation")
+        self.url = url
+        self.page = Page(self)
+        self.page.run(self.window.ipc.preload_script())
+        self.window.ipc.initialize()
+
+    def begin_invoke(self, func):
+        return self.dispatcher.begin_invoke(func)
+
+    def invoke(self, func):
+        if self.metrics is None:
+            return self.dispatcher.invoke(func)
+
+        started = time.perf_counter()
+        try:
+            return self.dispatcher.invoke(func)
+        finally:
+            self.metrics.since("dispatcher.invoke.ms", started)
+
+    @invoke_in_gui
+    def resize(self, width, height):
+        self._size = width, height
+
+    @invoke_in_gui
+    def move(self, dx, dy):
+        x, y = self._position
+        self._position = x + dx, y + dy
+
+    @invoke_in_gui
+    def move_abs(self, x, y):
+        self._position = x, y
+
+    @invoke_in_gui
+    def show(self):
+        self.visible = True
+        self.window.shown.set()
+
+    @invoke_in_gui
+    def normalize(self):
+        self.state = None
+
+    @invoke_in_gui
+    def maximize(self):
+        self.state = "maximized"
+
+    @invoke_in_gui
+    def minimize(self):
+        self.state = "minimized"
+
+    @invoke_in_gui
+    def hide(self):
+        self.visible = False
+
+    @invoke_in_gui
+    def close(self):
+        self.window.closing.set()
+        self.visible = False
+        self.instances.remove(self.window)
+        self.page.reject_all("CallCancelledError", "closed")
+        self.window.ipc.handle_reset("closed")
+        self.window.closed.set()
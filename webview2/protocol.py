@@ -0,0 +1,62 @@
+import json
+from itertools import count
+from uuid import uuid4
+
+CALL, RESULT, RESULTS, CHUNK, STREAM, READY, TRACE, PUBLISHED, STATE = range(9)
+
+
+class ProtocolV1:
+    version = 1
+
+    def next_id(self):
+        return uuid4().hex
+
+    def script_args(self, args):
+        return f"JSON.parse({repr(json.dumps(args))})"
+
+
+class ProtocolV2:
+    version = 2
+
+    def __init__(self):
+        self._ids = count()
+
+    def next_id(self):
+        return next(self._ids)
+
+    def script_args(self, args):
+        return json.dumps(args)
+
+
+protocols = {1: ProtocolV1, 2: ProtocolV2}
+
+
+def _loads(result):
+    return None if result is None else json.loads(result)
+
+
+def decode(message):
+    message_type = message[0]
+
+    if isinstance(message[1], list):
+        data = message[1]
+
+        if message_type == RESULT:
+            call_id, result, is_exc = data
+            return RESULT, [(call_id, _loads(result), is_exc)]
+
+        if message_type == RESULTS:
+            return RESULT, [
+                (call_id, _loads(result), is_exc) for call_id, result, is_exc in data
+            ]
+
+        return message_type, data
+
+    if message_type == RESULT:
+        _, call_id, is_exc, result = message
+        return RESULT, [(call_id, result, is_exc)]
+
+    if message_type == RESULTS:
+        return RESULT, list(zip(message[1::3], message[3::3], message[2::3]))
+
+    return message_type, message[1:]
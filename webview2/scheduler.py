@@ -0,0 +1,160 @@
+import asyncio
+import heapq
+import time
+from itertools import count
+
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+
+
+def priority(level):
+    def decorator(func):
+        func.priority = level
+        return func
+
+    return decorator
+
+
+class CallScheduler:
+    def __init__(self, max_concurrency=None, max_queue=None, parent=None):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.parent = parent
+        self.running = 0
+        self.queued = 0
+        self.tasks = set()
+        self.submitted = self.rejected = self.completed = self.cancelled = 0
+        self.max_queued = 0
+        self.wait_total = 0
+        self._queue = []
+        self._blocked = []
+        self._ids = count()
+
+    def _full(self):
+        return self.max_concurrency is not None and self.running >= self.max_concurrency
+
+    def _queue_full(self):
+        if self.parent and self.parent._queue_full():
+            return True
+
+        return self.max_queue is not None and self.queued >= self.max_queue
+
+    def _acquire(self, child):
+        if self._full():
+            if child not in self._blocked:
+                self._blocked.append(child)
+
+            return False
+
+        if self._blocked and child in self._blocked:
+            self._blocked.remove(child)
+
+        self.running += 1
+        return True
+
+    def _release(self):
+        self.running -= 1
+        self.completed += 1
+
+        if not self._blocked:
+            return
+
+        blocked = [child for child in self._blocked if child._queue]
+
+        for child in sorted(blocked, key=lambda child: child._queue[0][:2]):
+            if self._full():
+                break
+
+            child._pump()
+
+    def _count(self, name, amount=1):
+        setattr(self, name, getattr(self, name) + amount)
+
+        if name == "queued":
+            self.max_queued = max(self.max_queued, self.queued)
+
+        if self.parent:
+            self.parent._count(name, amount)
+
+    def submit(self, level, job):
+        self.submitted += 1
+        parent = self.parent
+
+        if parent:
+            parent.submitted += 1
+
+        if not self._queue and not self._full():
+            if parent is None or parent._acquire(self):
+                self._start(job)
+                return True
+
+        if self._queue_full():
+            self._count("rejected")
+            return False
+
+        heapq.heappush(self._queue, (level, next(self._ids), time.perf_counter(), job))
+        self._count("queued")
+        self._pump()
+        return True
+
+    def _pump(self):
+        while self._queue and not self._full():
+            if self.parent and not self.parent._acquire(self):
+                return
+
+            _, _, queued, job = heapq.heappop(self._queue)
+            self._count("queued", -1)
+            self._count("wait_total", time.perf_counter() - queued)
+            self._start(job)
+
+    def _start(self, job):
+        self.running += 1
+        task = asyncio.create_task(job())
+        self.tasks.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task):
+        self.tasks.discard(task)
+        self.running -= 1
+        self.completed += 1
+
+        if self.parent:
+            self.parent._release()
+
+        self._pump()
+
+    def spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def clear(self):
+        self._count("queued", -len(self._queue))
+        self._count("cancelled", len(self._queue))
+        self._queue.clear()
+
+        if self.parent and self in self.parent._blocked:
+            self.parent._blocked.remove(self)
+
+    def stats(self):
+        started = self.completed + self.running
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "cancelled": self.cancelled,
+            "completed": self.completed,
+            "mean_wait_ms": self.wait_total / started * 1000 if started else 0,
+        }
+
+
+global_scheduler = CallScheduler()
+
+
+def configure_scheduler(max_concurrency=None, max_queue=None):
+    global_scheduler.max_concurrency = max_concurrency
+    global_scheduler.max_queue = max_queue
@@ -0,0 +1,349 @@
+import asyncio
+import json
+
+from webview2.events import EventStream
+
+
+def escape(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def encode_op(op, path, value=None):
+    if op == "remove":
+        return f'{{"op":"remove","path":{json.dumps(path)}}}'
+
+    return f'{{"op":"{op}","path":{json.dumps(path)},"value":{json.dumps(value)}}}'
+
+
+def wrap(value, state, parent, key):
+    if isinstance(value, dict):
+        return StateDict(state, parent, key, value)
+
+    if isinstance(value, (list, tuple)):
+        return StateList(state, parent, key, value)
+
+    return value
+
+
+class Node:
+    def _attach(self, state, parent, key):
+        self._state = state
+        self._parent = parent
+        self._key = key
+
+    def _path(self):
+        if self._parent is None:
+            return ""
+
+        return f"{self._parent._path()}/{escape(self._key)}"
+
+    def _record(self, op, key, value=None):
+        if self._state is not None:
+            self._state.record(encode_op(op, f"{self._path()}/{escape(key)}", value))
+
+    def _record_self(self):
+        if self._state is not None:
+            self._state.record(encode_op("replace", self._path(), self))
+
+
+def release(*values):
+    for value in values:
+        if isinstance(value, Node):
+            value._bind(None)
+            value._parent = None
+
+
+class StateDict(Node, dict):
+    def __init__(self, state=None, parent=None, key=None, items=()):
+        self._attach(None, parent, key)
+        dict.__init__(self)
+
+        for item_key, value in dict(items).items():
+            dict.__setitem__(self, item_key, wrap(value, None, self, item_key))
+
+        self._bind(state)
+
+    def _bind(self, state):
+        self._state = state
+
+        for value in self.values():
+            if isinstance(value, Node):
+                value._bind(state)
+
+    def __setitem__(self, key, value):
+        old = dict.get(self, key)
+
+        if key in self and old is value:
+            return
+
+        op = "replace" if key in self else "add"
+        value = wrap(value, self._state, self, key)
+        dict.__setitem__(self, key, value)
+        release(old)
+        self._record(op, key, value)
+
+    def __delitem__(self, key):
+        release(dict.pop(self, key))
+        self._record("remove", key)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+
+        value = dict.pop(self, key)
+        release(value)
+        self._record("remove", key)
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        release(value)
+        self._record("remove", key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        release(*self.values())
+        dict.clear(self)
+        self._record_self()
+
+
+class StateList(Node, list):
+    def __init__(self, state=None, parent=None, key=None, items=()):
+        self._attach(None, parent, key)
+        list.__init__(
+            self, (wrap(value, None, self, index) for index, value in enumerate(items))
+        )
+        self._bind(state)
+
+    def _bind(self, state):
+        self._state = state
+
+        for value in self:
+            if isinstance(value, Node):
+                value._bind(state)
+
+    def _reindex(self, start=0):
+        for index in range(start, len(self)):
+            value = list.__getitem__(self, index)
+
+            if isinstance(value, Node):
+                value._key = index
+
+    def _changed(self):
+        self._reindex()
+        self._record_self()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            old = list.__getitem__(self, index)
+            list.__setitem__(
+                self, index, [wrap(item, self._state, self, None) for item in value]
+            )
+            release(*old)
+            self._changed()
+            return
+
+        index = range(len(self))[index]
+        old = list.__getitem__(self, index)
+        value = wrap(value, self._state, self, index)
+        list.__setitem__(self, index, value)
+        release(old)
+        self._record("replace", index, value)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            old = list.__getitem__(self, index)
+            list.__delitem__(self, index)
+            release(*old)
+            self._changed()
+            return
+
+        self.pop(index)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __imul__(self, count):
+        self[:] = list(self) * count
+        return self
+
+    def append(self, value):
+        value = wrap(value, self._state, self, len(self))
+        list.append(self, value)
+        self._record("add", "-", value)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def insert(self, index, value):
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        value = wrap(value, self._state, self, index)
+        list.insert(self, index, value)
+        self._reindex(index + 1)
+        self._record("add", index, value)
+
+    def pop(self, index=-1):
+        index = range(len(self))[index]
+        value = list.pop(self, index)
+        self._reindex(index)
+        release(value)
+        self._record("remove", index)
+        return value
+
+    def remove(self, value):
+        del self[self.index(value)]
+
+    def clear(self):
+        release(*self)
+        list.clear(self)
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
+
+
+class SharedState:
+    def __init__(self, name, initial=None, two_way=False):
+        self.name = name
+        self.two_way = two_way
+        self.version = 0
+        self.windows = []
+        self.changed = EventStream()
+        self.data = StateDict(self, None, None, initial or {})
+        self._ops = []
+        self._loop = asyncio.get_running_loop()
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+    def __delitem__(self, key):
+        del self.data[key]
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def attach(self, window):
+        if window not in self.windows:
+            self.flush()
+            self.windows.append(window)
+            window._states[self.name] = self
+
+            if window._bridge_ready:
+                self.sync(window)
+
+    def detach(self, window):
+        if window in self.windows:
+            self.windows.remove(window)
+            window._states.pop(self.name, None)
+
+    def record(self, op):
+        if not self._ops:
+            self._loop.call_soon(self.flush)
+
+        self._ops.append(op)
+
+    def _script(self, func, *args):
+        return f"webview.{func}({json.dumps(self.name)}, {', '.join(args)})"
+
+    def flush(self, origin=None):
+        if not self._ops:
+            return
+
+        ops, self._ops = self._ops, []
+        self.version += 1
+        patch = self._script("_statePatch", str(self.version), f"[{','.join(ops)}]")
+        ack = self._script("_statePatch", str(self.version), "[]")
+
+        for window in self.windows:
+            if window._bridge_ready:
+                window._run_script(ack if window is origin else patch)
+
+    def sync(self, window):
+        self.flush()
+        window._run_script(
+            self._script(
+                "_stateReset",
+                str(self.version),
+                json.dumps(self.data),
+                json.dumps(self.two_way),
+            )
+        )
+
+    def receive(self, window, version, ops):
+        self.flush()
+
+        if not self.two_way or version != self.version:
+            self.sync(window)
+            return
+
+        ops = json.loads(ops)
+
+        try:
+            for op in ops:
+                self.apply(op)
+
+        except (KeyError, IndexError, TypeError, ValueError):
+            self.sync(window)
+            return
+
+        self.flush(origin=window)
+        self.changed.set(window, ops)
+
+    def apply(self, op):
+        tokens = [unescape(token) for token in op["path"].split("/")[1:]]
+
+        if not tokens:
+            self.data.clear()
+            self.data.update(op.get("value") or {})
+            return
+
+        target = self.data
+        for token in tokens[:-1]:
+            target = target[int(token) if isinstance(target, list) else token]
+
+        key = tokens[-1]
+
+        if isinstance(target, list):
+            if op["op"] == "add":
+                if key == "-":
+                    target.append(op["value"])
+                else:
+                    target.insert(int(key), op["value"])
+            elif op["op"] == "replace":
+                target[int(key)] = op["value"]
+            else:
+                del target[int(key)]
+
+        elif op["op"] == "remove":
+            del target[key]
+
+        else:
+            target[key] = op["value"]
@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+import time
+
+
+class Tracer:
+    def __init__(self, filename=None, max_events=1_000_000):
+        self.filename = filename
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self.pid = os.getpid()
+        self.pages = {}
+        self.threads = {}
+        self._offset = time.time() - time.perf_counter()
+
+    def _add(self, event):
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+        else:
+            self.events.append(event)
+
+    def span(self, name, start, end=None, **args):
+        end = time.perf_counter() if end is None else end
+        thread = threading.current_thread()
+        self.threads.setdefault(thread.ident, thread.name)
+        self._add(
+            {
+                "name": name,
+                "cat": "python",
+                "ph": "X",
+                "ts": (start + self._offset) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self.pid,
+                "tid": thread.ident,
+                "args": args,
+            }
+        )
+
+    def wrap(self, name, func, **args):
+        queued = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            self.span("gui.queue", queued, started, **args)
+
+            try:
+                return func()
+            finally:
+                self.span(name, started, **args)
+
+        return run
+
+    def add_page(self, page, name):
+        return self.pages.setdefault(page, (len(self.pages) + 1, name))[0]
+
+    def add_js(self, page, spans):
+        pid = self.add_page(page, "page")
+
+        for name, call_id, origin, start, duration in spans:
+            self._add(
+                {
+                    "name": name,
+                    "cat": "js",
+                    "ph": "X",
+                    "ts": start * 1000,
+                    "dur": duration * 1000,
+                    "pid": pid,
+                    "tid": 1,
+                    "args": {"call_id": call_id, "origin": origin},
+                }
+            )
+
+    def trace(self):
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "args": {"name": "python"},
+            }
+        ]
+        metadata += [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in self.threads.items()
+        ]
+        metadata += [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}}
+            for pid, name in self.pages.values()
+        ]
+        return {
+            "traceEvents": metadata + self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped": self.dropped},
+        }
+
+    def save(self, filename=None):
+        with open(filename or self.filename, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f)
@@ -0,0 +1,99 @@
+import base64
+import re
+from itertools import count
+
+INLINE_THRESHOLD = 64 * 1024
+CHUNK_SIZE = 512 * 1024
+
+chunk_header = re.compile(r"([^:]*):(\d+):(\d+):")
+
+
+class Transfer:
+    def __init__(self, threshold=INLINE_THRESHOLD, chunk_size=CHUNK_SIZE, prefix="py"):
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self.prefix = prefix
+        self._ids = count()
+        self._incoming = {}
+        self._complete = {}
+
+    def _encode_bytes(self, data, send_chunk):
+        data = memoryview(data).cast("B")
+
+        if len(data) <= self.threshold:
+            return {"$bytes": base64.b64encode(data).decode()}
+
+        transfer_id = f"{self.prefix}-{next(self._ids)}"
+        total = -(-len(data) // self.chunk_size)
+
+        for index in range(total):
+            chunk = data[index * self.chunk_size : (index + 1) * self.chunk_size]
+            send_chunk(
+                f"{transfer_id}:{index}:{total}:{base64.b64encode(chunk).decode()}"
+            )
+
+        return {"$transfer": transfer_id, "size": len(data)}
+
+    def encode(self, value, send_chunk):
+        has_binary = False
+
+        def walk(value):
+            nonlocal has_binary
+
+            if isinstance(value, (bytes, bytearray, memoryview)):
+                has_binary = True
+                return self._encode_bytes(value, send_chunk)
+
+            if isinstance(value, dict):
+                return {key: walk(item) for key, item in value.items()}
+
+            if isinstance(value, (list, tuple)):
+                return [walk(item) for item in value]
+
+            return value
+
+        return walk(value), has_binary
+
+    def receive(self, message):
+        match = chunk_header.match(message)
+        transfer_id, index, total = match[1], int(match[2]), int(match[3])
+
+        chunks = self._incoming.setdefault(transfer_id, {})
+        chunks[index] = base64.b64decode(message[match.end() :])
+
+        if len(chunks) == total:
+            del self._incoming[transfer_id]
+            self._complete[transfer_id] = b"".join(chunks[i] for i in range(total))
+
+    def clear(self):
+        self._incoming.clear()
+        self._complete.clear()
+
+    def discard(self, value):
+        if isinstance(value, dict):
+            if "$transfer" in value:
+                self._complete.pop(value["$transfer"], None)
+                return
+
+            value = value.values()
+
+        elif not isinstance(value, list):
+            return
+
+        for item in value:
+            self.discard(item)
+
+    def decode(self, value):
+        if isinstance(value, dict):
+            if "$bytes" in value:
+                return base64.b64decode(value["$bytes"])
+
+            if "$transfer" in value:
+                return self._complete.pop(value["$transfer"])
+
+            return {key: self.decode(item) for key, item in value.items()}
+
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+
+        return value
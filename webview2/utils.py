@@ -1,13 +1,22 @@
 import asyncio
-import platform
+import os
+import threading
+import time
 import traceback
-from functools import wraps
-from pynput import mouse
+from collections import deque
+from functools import cache, wraps
 
-from webview2.js import path as js_path
 
-with (js_path / "api.js").open() as f:
-    js_api = f.read()
+@cache
+def load_js_api():
+    with open(os.path.join(os.path.dirname(__file__), "js", "api.js")) as f:
+        return f.read()
+
+
+def mouse():
+    from pynput import mouse
+
+    return mouse
 
 
 def try_except(func):
@@ -24,12 +33,21 @@ def try_except(func):
 
 
 class DragMover:
-    def __init__(self, window):
+    def __init__(self, window, interval=1 / 60):
         self.window = window
+        self.interval = interval
         self.last_x = self.now_x = 0
         self.last_y = self.now_y = 0
         self.listener = None
-        self.controller = mouse.Controller()
+        self.controller = None
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._timer = None
+        self._due = None
+        self._scheduled = False
+        self._pending_since = None
+        self._applied_at = 0
+        self.reset_stats()
 
     @property
     def dx(self):
@@ -40,10 +58,107 @@ class DragMover:
         return self.now_y - self.last_y
 
     def on_move(self, x, y):
-        self.last_x = self.now_x
-        self.last_y = self.now_y
-        self.now_x, self.now_y = self.controller.position
-        self.window.gui.move(self.dx, self.dy)
+        self.feed(*self.controller.position)
+
+    def feed(self, x, y, timestamp=None):
+        timestamp = timestamp or time.perf_counter()
+
+        if not self.interval:
+            self.last_x = self.now_x
+            self.last_y = self.now_y
+            self.now_x, self.now_y = x, y
+            self.events += 1
+            self.window.gui.move(self.dx, self.dy)
+            self.updates += 1
+            self.lags.append(time.perf_counter() - timestamp)
+            return
+
+        with self._lock:
+            self.events += 1
+            self.now_x, self.now_y = x, y
+
+            if self._pending_since is None:
+                self._pending_since = timestamp
+
+            if self._scheduled:
+                return
+
+            self._scheduled = True
+            due = self._applied_at + self.interval
+
+            if due > time.perf_counter():
+                self._due = due
+                self._start_timer()
+                self._wake.notify()
+                return
+
+        self._schedule()
+
+    def _start_timer(self):
+        if self._timer is None:
+            self._timer = threading.Thread(
+                target=self._run_timer, name="drag-timer", daemon=True
+            )
+            self._timer.start()
+
+    def _run_timer(self):
+        with self._lock:
+            while self._timer is threading.current_thread():
+                if self._due is None:
+                    self._wake.wait()
+                    continue
+
+                delay = self._due - time.perf_counter()
+
+                if delay > 0:
+                    self._wake.wait(delay)
+                    continue
+
+                self._due = None
+                self._schedule()
+
+    def _stop_timer(self):
+        with self._lock:
+            self._timer = None
+            self._wake.notify()
+
+            if self._due is not None:
+                self._due = None
+                self._schedule()
+
+    def _schedule(self):
+        self.window.gui.begin_invoke(self._apply)
+
+    def _apply(self):
+        with self._lock:
+            dx, dy = self.dx, self.dy
+            self.last_x, self.last_y = self.now_x, self.now_y
+            pending_since = self._pending_since
+            self._pending_since = None
+            self._scheduled = False
+            self._applied_at = time.perf_counter()
+
+        if dx or dy:
+            self.window.gui.move(dx, dy)
+
+        self.updates += 1
+        self.lags.append(time.perf_counter() - pending_since)
+
+    def reset_stats(self):
+        self.events = self.updates = 0
+        self.lags = deque(maxlen=1000)
+        self._started = time.perf_counter()
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._started
+
+        return {
+            "events": self.events,
+            "updates": self.updates,
+            "updates_per_sec": self.updates / elapsed if elapsed else 0,
+            "lag_mean_ms": sum(self.lags) / len(self.lags) * 1000 if self.lags else 0,
+            "lag_max_ms": max(self.lags) * 1000 if self.lags else 0,
+        }
 
     def on_click(self, x, y, button, pressed):
         if self.listener and not pressed:
@@ -52,85 +167,140 @@ class DragMover:
     async def start_drag(self, x, y):
         self.last_x = self.now_x = x
         self.last_y = self.now_y = y
-        self.listener = mouse.Listener(on_move=self.on_move, on_click=self.on_click)
+        self.reset_stats()
+
+        if self.controller is None:
+            self.controller = mouse().Controller()
+
+        self.listener = mouse().Listener(on_move=self.on_move, on_click=self.on_click)
         self.listener.start()
 
     def stop_drag(self):
         self.listener.stop()
         self.listener = None
+        self._stop_timer()
 
 
 class Event(asyncio.Event):
     def __init__(self, init_args=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        self._loop = asyncio.get_running_loop()
+        self._arg_waiters = []
         self.args = init_args
 
     def set(self, *args):
-        self._loop.call_soon_threadsafe(super().set)
-        self.args = args or None
+        self._loop.call_soon_threadsafe(self._set, args)
 
-    async def wait(self):
-        await super().wait()
-        return self.args
+    def _set(self, args):
+        self.args = args or None
+        super().set()
 
+        for waiter in self._arg_waiters:
+            settle(waiter, self.args)
 
-# class ListeningEvent(asyncio.Event):
-#     def __init__(self, *args, **kwargs):
-#         super().__init__(*args, **kwargs)
+        self._arg_waiters.clear()
 
-#         self.callbacks = []
+    async def wait(self):
+        if self.is_set():
+            return self.args
 
-#     async def _callback(self, callback, *args, **kwargs):
-#         if await callback(*args, **kwargs):
-#             self.callbacks.remove(callback)
+        waiter = self._loop.create_future()
+        self._arg_waiters.append(waiter)
+        return await waiter
 
-#     def _set(self, *args, **kwargs):
-#         super().set()
 
-#         asyncio.gather(
-#             *(self._callback(callback, *args, **kwargs) for callback in self.callbacks),
-#             loop=self._loop,
-#         )
+def invoke_in_gui(func):
+    @wraps(func)
+    def wrap(self, *args, **kwargs):
+        return self.invoke(lambda: func(self, *args, **kwargs))
 
-#     def set(self, *args, **kwargs):
-#         self._loop.call_soon_threadsafe(
-#             lambda: self._set(*args, **kwargs),
-#         )
+    wrap.gui_func = func
+    return wrap
 
-#     async def wait(self):
-#         await super().wait()
 
-#     def __add__(self, callback):
-#         self.callbacks.append(callback)
-#         return self
+def invoke_in_gui_async(func):
+    @wraps(func)
+    def wrap(self, *args, **kwargs):
+        return self.invoke_async(lambda: func(self, *args, **kwargs))
 
-#     def __sub__(self, callback):
-#         self.callbacks.remove(callback)
-#         return self
+    return wrap
 
 
-def invoke_in_gui(func):
+def invoke_in_gui_nowait(func):
     @wraps(func)
     def wrap(self, *args, **kwargs):
-        return self.invoke(lambda: func(self, *args, **kwargs))
+        self.invoke_nowait(lambda: func(self, *args, **kwargs))
 
     return wrap
 
 
+def settle(future, result=None, exception=None):
+    if future.done():
+        return
+
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+class StateMirror:
+    def __init__(self):
+        self._values = {"version": 0}
+
+    @property
+    def version(self):
+        return self._values["version"]
+
+    def __getitem__(self, name):
+        return self._values[name]
+
+    def snapshot(self):
+        return dict(self._values)
+
+    def update(self, **values):
+        if any(self._values.get(name) != value for name, value in values.items()):
+            self._values = {**self._values, **values, "version": self.version + 1}
+
+
+class Credit:
+    def __init__(self, credit):
+        self.credit = credit
+        self.task = None
+        self._added = asyncio.Event()
+
+    def add(self, amount):
+        self.credit += amount
+        self._added.set()
+
+    async def acquire(self):
+        while not self.credit:
+            self._added.clear()
+            await self._added.wait()
+
+        self.credit -= 1
+
+
+def format_exception(e):
+    return {
+        "message": str(e),
+        "name": type(e).__name__,
+        "stack": "".join(traceback.format_exception(type(e), e, e.__traceback__)),
+    }
+
+
 async def try_call(method, args):
     try:
         return await method(*args), False
 
     except Exception as e:
-        return {
-            "message": str(e),
-            "name": type(e).__name__,
-            "stack": traceback.format_exc(),
-        }, True
+        return format_exception(e), True
 
 
 def is_64bit():
+    import platform
+
     return platform.architecture()[0] == "64bit"
 
 
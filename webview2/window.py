@@ -1,9 +1,40 @@
 import asyncio
+import inspect
 import json
-from uuid import uuid4
+import time
+import traceback
+from functools import partial
+from itertools import count
 
-from webview2.error import JSError
-from webview2.utils import Event, try_call
+from webview2.cookies import load_netscape, normalize, save_netscape
+from webview2.error import (
+    CallCancelledError,
+    JSError,
+    OverloadedError,
+    TooManyCallsError,
+)
+from webview2.events import EventStream
+from webview2.executor import Handler
+from webview2.metrics import DEPTH_BUCKETS, Metrics
+from webview2.protocol import (
+    CALL,
+    PUBLISHED,
+    READY,
+    RESULT,
+    STATE,
+    STREAM,
+    TRACE,
+    ProtocolV1,
+    decode,
+    protocols,
+)
+from webview2.scheduler import CallScheduler, global_scheduler
+from webview2.state import SharedState
+from webview2.trace import Tracer
+from webview2.transfer import INLINE_THRESHOLD, Transfer
+from webview2.utils import Credit, format_exception, settle, try_call
+
+STREAM_CREDIT = 16
 
 
 class Window:
@@ -15,41 +46,204 @@ class Window:
         cookie_manager=None,
         ipc=None,
         navigate_handler=None,
+        batch_calls=False,
+        transfer_threshold=None,
+        call_timeout=None,
+        max_pending_calls=None,
+        protocol=2,
+        metrics=False,
+        trace=None,
+        max_concurrent_calls=None,
+        max_queued_calls=None,
     ):
         self._future_map = {}
+        self._generation = 0
+        self._protocol = ProtocolV1()
+        self._call_batch = None
+        self._transfer = Transfer(
+            INLINE_THRESHOLD if transfer_threshold is None else transfer_threshold
+        )
+        self._streams = {}
         self._js_api = {}
         self._loop = asyncio.get_running_loop()
+        self._bridge_ready = False
+        self._waiting = []
+        self._queued_ids = set()
+        self._navigation_started = time.perf_counter()
+        self._first_call_pending = True
+        self._bridge_stats = {"ready_ms": None, "first_call_ms": None}
+        self._metrics = None
+        self._export_handle = None
+        self._tracer = None
+        self._topics = {}
+        self._publishing = None
+        self._publish_ids = count()
+        self._states = {}
+        self._prepared = {}
+        self._prepared_ids = count()
+        self._scheduler = CallScheduler(
+            max_concurrent_calls, max_queued_calls, global_scheduler
+        )
 
-        self.shown = Event()
-        self.ready = Event()
-        self.navigated = Event(init_args=url)
-        self.new_window = Event()
-        self.closing = Event()
-        self.closed = Event()
+        self.shown = EventStream()
+        self.ready = EventStream()
+        self.navigated = EventStream(init_args=url)
+        self.new_window = EventStream()
+        self.closing = EventStream()
+        self.closed = EventStream()
+        self.closed.subscribe(self._close_events)
 
         self.js_api = js_api
+        self.batch_calls = batch_calls
+        self.call_timeout = call_timeout
+        self.max_pending_calls = max_pending_calls
         self.gui = gui
         self.cookie_manager = cookie_manager
         self.ipc = ipc
         self.navigate_handler = navigate_handler
 
         self.ipc.handle_ipc = self._handle_ipc
+        self.ipc.handle_reset = self._handle_reset
+        self.ipc.handle_bridge = self._handle_bridge
+        self.ipc.bridge_config = {
+            "protocols": sorted(
+                (version for version in protocols if version <= protocol), reverse=True
+            ),
+            "generation": self._generation,
+            "timeout": call_timeout and call_timeout * 1000,
+            "maxPending": max_pending_calls,
+            "transferThreshold": self._transfer.threshold,
+        }
+
+        if metrics:
+            self.enable_metrics()
+
+        if trace:
+            self.start_trace(Tracer(trace))
+
+    async def _send_stream(self, stream_id, api, args, generation):
+        if generation != self._generation:
+            self._transfer.discard(args)
+            return
+
+        credit = self._streams[stream_id] = Credit(STREAM_CREDIT)
+        credit.task = asyncio.current_task()
+        error = None
+
+        try:
+            self._notify(
+                "webview._resultOk", (stream_id, {"$stream": stream_id}, False)
+            )
+            stream = api.stream(self._transfer.decode(args))
+
+            try:
+                async for item in stream:
+                    await credit.acquire()
+                    self._notify("webview._streamItem", (stream_id, item))
+            finally:
+                await stream.aclose()
+
+        except asyncio.CancelledError:
+            error = format_exception(CallCancelledError("stream cancelled"))
+            raise
+
+        except Exception as e:
+            error = format_exception(e)
+
+        finally:
+            self._streams.pop(stream_id, None)
+
+            if generation == self._generation:
+                try:
+                    self._notify("webview._streamEnd", (stream_id, error))
+                except Exception:
+                    traceback.print_exc()
+
+    def _stream_control(self, stream_id, action, amount):
+        if stream_id not in self._streams:
+            return
+
+        if action == "credit":
+            self._streams[stream_id].add(amount)
+
+        elif action == "cancel":
+            self._streams.pop(stream_id).task.cancel()
+
+    async def _invoke_api(self, api, args):
+        try:
+            args = self._transfer.decode(args)
+
+        except Exception:
+            self._transfer.discard(args)
+            raise
+
+        return await api(*args)
 
     def _call_python(self, call_id, name, args):
+        api = self._js_api.get(name)
+        metrics = self._metrics
+
+        if api is None:
+            self._transfer.discard(args)
+            error = NameError(f"{name} is not a js_api function")
+            self._reply(call_id, format_exception(error), True)
+            return
+
+        generation = self._generation
+        tracer = self._tracer
+        submitted = time.perf_counter()
+
         async def _call():
-            await self.call(
-                "webview._resultOk",
-                call_id,
-                *(await try_call(self._js_api[name], args)),
-            )
+            started = time.perf_counter()
+
+            if metrics:
+                metrics.observe("scheduler.wait.ms", (started - submitted) * 1000)
+            result = await try_call(self._invoke_api, (api, args))
+
+            if tracer:
+                tracer.span(f"api.{name}", started, call_id=call_id, origin="js")
 
-        asyncio.create_task(_call())
+            if metrics:
+                metrics.since(f"api.{name}.ms", started)
+
+                if result[1]:
+                    metrics.count(f"api.{name}.errors")
+
+            if generation == self._generation:
+                self._reply(call_id, *result)
+
+        job = _call
+
+        if inspect.isasyncgenfunction(api.func):
+            if metrics:
+                metrics.count(f"api.{name}.streams")
+
+            job = partial(self._send_stream, call_id, api, args, generation)
+
+        if not self._scheduler.submit(api.priority, job):
+            self._transfer.discard(args)
+
+            if metrics:
+                metrics.count("scheduler.rejected")
+
+            error = OverloadedError(f"{name} rejected: too many queued calls")
+            self._reply(call_id, format_exception(error), True)
+
+    def _reply(self, call_id, result, is_exc):
+        self._notify("webview._resultOk", (call_id, result, is_exc), call_id)
 
     def _result_ok(self, call_id, result, is_exc):
-        future = self._future_map.pop(call_id)
+        future = self._future_map.pop(call_id, None)
+
+        if future is None:
+            self._transfer.discard(result)
+            return
 
-        if result is not None:
-            result = json.loads(result)
+        if self._first_call_pending:
+            self._first_call_pending = False
+            self._bridge_stats["first_call_ms"] = self._since_navigation()
+
+        result = self._transfer.decode(result)
 
         if not future.done():
             if is_exc:
@@ -57,12 +251,223 @@ class Window:
             else:
                 future.set_result(result)
 
-    def _handle_ipc(self, message_type, data):
-        if message_type == 0:
-            self._loop.call_soon_threadsafe(self._call_python, *data)
+    def _fail_calls(self, call_ids, exc):
+        for call_id in call_ids:
+            future = self._future_map.pop(call_id, None)
+
+            if future and not future.done():
+                future.set_exception(exc)
+
+    def _reset_calls(self, exc):
+        self._fail_calls(
+            [
+                call_id
+                for call_id in self._future_map
+                if call_id not in self._queued_ids
+            ],
+            exc,
+        )
+
+        for credit in self._streams.values():
+            credit.task.cancel()
+
+        self._streams.clear()
+        self._transfer.clear()
+
+    def _set_protocol(self, version):
+        if version != self._protocol.version:
+            self._protocol = protocols[version]()
+
+    def _since_navigation(self):
+        return (time.perf_counter() - self._navigation_started) * 1000
+
+    def _bridge_up(self, version):
+        self._set_protocol(version)
+
+        if self._bridge_ready:
+            return
+
+        self._bridge_ready = True
+        self._bridge_stats["ready_ms"] = self._since_navigation()
+
+        waiting, self._waiting = self._waiting, []
+        self._queued_ids.clear()
+
+        for prepared in self._prepared.values():
+            self._register_prepared(prepared)
+
+        for func in waiting:
+            self.ipc.invoke_nowait(func)
+
+        for state in self._states.values():
+            state.sync(self)
 
-        elif message_type == 1:
-            self._loop.call_soon_threadsafe(self._result_ok, *data)
+    def _send(self, func, call_ids=()):
+        if self._bridge_ready:
+            self.ipc.invoke_nowait(func)
+        else:
+            self._waiting.append(func)
+            self._queued_ids.update(call_ids)
+
+    def _reset(self, reason):
+        self._bridge_ready = False
+        self._navigation_started = time.perf_counter()
+        self._first_call_pending = True
+
+        if reason != "navigation":
+            self._waiting.clear()
+            self._queued_ids.clear()
+            self._topics.clear()
+
+        self._reset_calls(CallCancelledError(reason))
+        self._scheduler.clear()
+
+        if self._publishing is not None:
+            self._publishing = None
+            self._flush_topics()
+
+    def _handle_bridge(self, version):
+        self._loop.call_soon_threadsafe(self._bridge_up, version)
+
+    def _handle_reset(self, reason):
+        self._generation += 1
+        self.ipc.bridge_config["generation"] = self._generation
+        self._loop.call_soon_threadsafe(self._reset, reason)
+
+    def _js_callback(self, call_ids):
+        def callback(result, is_exc):
+            if is_exc:
+                self._loop.call_soon_threadsafe(self._fail_calls, call_ids, result)
+
+        return callback
+
+    def _queue_call(self, call_id, script):
+        if self._call_batch is None:
+            self._call_batch = []
+            self._loop.call_soon(self._flush_calls)
+
+        self._call_batch.append((call_id, script))
+
+    def _flush_calls(self):
+        batch, self._call_batch = self._call_batch, None
+        call_ids = [call_id for call_id, _ in batch]
+        callback = self._js_callback(call_ids)
+        func = lambda: self.ipc.call_js(batch, callback)
+
+        if self._tracer:
+            func = self._tracer.wrap(
+                "gui.call_js", func, call_id=call_ids, origin="python"
+            )
+
+        self._send(func, call_ids)
+
+    def _dispatch(self, message):
+        if isinstance(message, str):
+            self._transfer.receive(message)
+            return
+
+        message_type, data = decode(message)
+
+        if message_type == CALL:
+            self._call_python(*data)
+
+        elif message_type == RESULT:
+            for result in data:
+                self._result_ok(*result)
+
+        elif message_type == STREAM:
+            self._stream_control(*data)
+
+        elif message_type == READY:
+            self._bridge_up(*data)
+
+        elif message_type == STATE:
+            self._receive_state(*data)
+
+        elif message_type == PUBLISHED:
+            self._published(*data)
+
+        elif message_type == TRACE:
+            if self._tracer:
+                self._tracer.add_js(self, json.loads(*data))
+
+    def _trace_args(self, message):
+        if isinstance(message, str):
+            return {}
+
+        message_type, data = decode(message)
+
+        if message_type == CALL:
+            return {"call_id": data[0], "origin": "js"}
+
+        if message_type == RESULT:
+            call_ids = [call_id for call_id, _, _ in data]
+            return {
+                "call_id": call_ids[0] if len(call_ids) == 1 else call_ids,
+                "origin": "python",
+            }
+
+        return {}
+
+    def _dispatch_timed(self, message, queued, trace_args=None, size=None):
+        metrics = self._metrics
+
+        if self._tracer and trace_args:
+            self._tracer.span("loop.hop", queued, **trace_args)
+
+        if metrics:
+            metrics.since("loop.lag.ms", queued)
+
+            if size is not None:
+                metrics.observe_size("ipc.received.bytes", size)
+
+        self._dispatch(message)
+
+    def _handle_ipc(self, message, received=None, size=None):
+        if self._tracer:
+            queued = time.perf_counter()
+            trace_args = self._trace_args(message)
+
+            if received is not None:
+                self._tracer.span("gui.on_web_message", received, queued, **trace_args)
+
+            self._loop.call_soon_threadsafe(
+                self._dispatch_timed, message, queued, trace_args, size
+            )
+
+        elif self._metrics:
+            self._loop.call_soon_threadsafe(
+                self._dispatch_timed, message, time.perf_counter(), None, size
+            )
+
+        else:
+            self._loop.call_soon_threadsafe(self._dispatch, message)
+
+    def _receive_state(self, name, version, ops):
+        state = self._states.get(name)
+
+        if state:
+            state.receive(self, version, ops)
+
+    def _close_events(self, *args):
+        for state in list(self._states.values()):
+            state.detach(self)
+
+        if self._metrics and self._metrics.exporter:
+            self._export_stats()
+
+        if self._tracer and self._tracer.filename:
+            self._tracer.save()
+
+        for event in (
+            self.shown,
+            self.ready,
+            self.navigated,
+            self.new_window,
+            self.closing,
+            self.closed,
+        ):
+            event.close()
 
     @property
     def url(self):
@@ -72,36 +477,311 @@ class Window:
     def url(self, url):
         self.navigate_handler.navigate_to(url)
 
+    async def navigate(self, url):
+        await self.navigate_handler.navigate_to_async(url)
+
     @property
     def js_api(self):
-        return tuple(self._js_api.values())
+        return tuple(api.func for api in self._js_api.values())
 
     @js_api.setter
     def js_api(self, apis):
-        self._js_api = {api.__name__: api for api in apis}
+        self._js_api = {}
 
-    async def call(self, name, *args):
-        return await self.evaluate_js(
-            f"return {name}(...JSON.parse({repr(json.dumps(args))}))"
+        for api in apis:
+            self.add_api(api)
+
+    def add_api(
+        self,
+        func,
+        name=None,
+        policy=None,
+        max_concurrency=None,
+        cache=None,
+        priority=None,
+    ):
+        self._js_api[name or func.__name__] = Handler(
+            func, policy, max_concurrency, cache, priority
         )
 
-    async def evaluate_js(self, script):
-        call_id = uuid4().hex
-        future = self._future_map[call_id] = self._loop.create_future()
+    def invalidate_cache(self, name=None, *args):
+        for api_name, api in self._js_api.items():
+            if api.cache and name in (None, api_name):
+                api.cache.invalidate(*args)
 
-        def callback(result, is_exc):
-            if is_exc and not future.done():
-                self._loop.call_soon_threadsafe(future.set_exception, result)
+    def cache_stats(self):
+        return {
+            name: api.cache.stats() for name, api in self._js_api.items() if api.cache
+        }
+
+    @property
+    def protocol(self):
+        return self._protocol.version
+
+    def bridge_stats(self):
+        return {**self._bridge_stats, "queued": len(self._waiting)}
+
+    def enable_metrics(self, exporter=None, interval=None):
+        self.disable_metrics()
+        self._metrics = self.gui.metrics = Metrics(exporter, interval)
+
+        if exporter and interval:
+            self._export_handle = self._loop.call_later(interval, self._export_stats)
+
+        return self._metrics
+
+    def disable_metrics(self):
+        if self._export_handle:
+            self._export_handle.cancel()
+            self._export_handle = None
+
+        self._metrics = self.gui.metrics = None
+
+    def _export_stats(self):
+        metrics = self._metrics
+
+        try:
+            metrics.exporter(self.stats())
+
+        except Exception:
+            traceback.print_exc()
+
+        if metrics.interval and not self.closed.is_set():
+            self._export_handle = self._loop.call_later(
+                metrics.interval, self._export_stats
+            )
+
+    def stats(self):
+        snapshot = self._metrics.snapshot() if self._metrics else {}
+
+        return {
+            **snapshot,
+            "gauges": {
+                "pending_calls": len(self._future_map),
+                "queued_calls": len(self._waiting),
+                "streams": len(self._streams),
+                "pending_topics": len(self._topics),
+            },
+            "events": {
+                name: getattr(self, name).dropped
+                for name in ("shown", "ready", "navigated", "new_window", "closing")
+            },
+            "scheduler": {
+                "window": self._scheduler.stats(),
+                "global": global_scheduler.stats(),
+            },
+            "bridge": self.bridge_stats(),
+            "cache": self.cache_stats(),
+            "open": type(self.gui).open_stats(),
+        }
+
+    def _post_chunk(self, message):
+        self._send(lambda: self.ipc.post_message(message))
+
+    def start_trace(self, tracer=None):
+        self._tracer = tracer or Tracer()
+        self._tracer.add_page(self, self.url)
+        self.ipc.bridge_config["trace"] = True
+        self.notify("webview._setTrace", True)
+        return self._tracer
+
+    def stop_trace(self, filename=None):
+        tracer, self._tracer = self._tracer, None
+        self.ipc.bridge_config["trace"] = False
+        self.notify("webview._setTrace", False)
+
+        if tracer and (filename or tracer.filename):
+            tracer.save(filename)
+
+        return tracer
 
-        self.ipc.evaluate_js(
-            f"webview._callJs('{call_id}', async () => {{ {script} }})", callback
+    def notify(self, name, *args):
+        self._notify(name, args)
+
+    def _notify(self, name, args, call_id=None):
+        args, has_binary = self._transfer.encode(args, self._post_chunk)
+        args = self._protocol.script_args(args)
+
+        if has_binary:
+            script = f"webview._decode({args}).then((args) => {name}(...args))"
+        else:
+            script = f"{name}(...{args})"
+
+        if self._metrics:
+            self._metrics.observe_size("ipc.sent.bytes", len(script))
+
+        func = lambda: self.ipc.evaluate_js(script)
+
+        if self._tracer and call_id is not None:
+            func = self._tracer.wrap("gui.reply", func, call_id=call_id, origin="js")
+
+        self._send(func)
+
+    async def call(self, name, *args, timeout=None):
+        args, has_binary = self._transfer.encode(args, self._post_chunk)
+        args = self._protocol.script_args(args)
+
+        if has_binary:
+            args = f"(await webview._decode({args}))"
+
+        return await self.evaluate_js(f"return {name}(...{args})", timeout)
+
+    def publish(self, topic, value):
+        self._publish(topic, json.dumps(value))
+
+    def _publish(self, topic, payload):
+        if self._metrics and topic in self._topics:
+            self._metrics.count("topics.coalesced")
+
+        self._topics[topic] = payload
+
+        if self._publishing is None:
+            self._flush_topics()
+
+    def _published(self, batch):
+        if batch == self._publishing:
+            self._publishing = None
+            self._flush_topics()
+
+    def _flush_topics(self):
+        topics, self._topics = self._topics, {}
+
+        if not topics:
+            return
+
+        batch = self._publishing = next(self._publish_ids)
+        values = ",".join(
+            f"{json.dumps(topic)}:{value}" for topic, value in topics.items()
         )
 
-        return await future
+        def callback(result, is_exc):
+            if is_exc:
+                self._loop.call_soon_threadsafe(self._published, batch)
+
+        self._run_script(f"webview._publish({{{values}}}, {batch})", callback)
+
+        if self._metrics:
+            self._metrics.count("topics.published", len(topics))
+
+    def _run_script(self, script, callback=None):
+        if self._metrics:
+            self._metrics.observe_size("ipc.sent.bytes", len(script))
+
+        self._send(lambda: self.ipc.evaluate_js(script, callback))
+
+    def state(self, name, initial=None, two_way=False):
+        if name not in self._states:
+            SharedState(name, initial, two_way).attach(self)
+
+        return self._states[name]
+
+    def prepare(self, source):
+        prepared = self._prepared.get(source)
+
+        if prepared is None:
+            prepared = self._prepared[source] = PreparedFunction(
+                self, next(self._prepared_ids), source
+            )
+
+            if self._bridge_ready:
+                self._register_prepared(prepared)
+
+        return prepared
+
+    def _register_prepared(self, prepared):
+        self._run_script(prepared.script())
+        self._run_script(f"webview._checkPrepared({prepared.handle})")
+
+    def _release_prepared(self, prepared):
+        if self._prepared.get(prepared.source) is prepared:
+            del self._prepared[prepared.source]
+
+            if self._bridge_ready:
+                self._run_script(f"webview._unprepare({prepared.handle})")
+
+    async def _call_prepared(self, prepared, args, timeout=None):
+        if self._prepared.get(prepared.source) is not prepared:
+            raise ValueError(f"prepared function {prepared.handle} was released")
+
+        args, has_binary = self._transfer.encode(args, self._post_chunk)
+
+        def send(call_id):
+            message = json.dumps([call_id, prepared.handle, args, has_binary])
+            func = lambda: self.ipc.post_json(message)
+
+            if self._tracer:
+                func = self._tracer.wrap(
+                    "gui.post_json", func, call_id=call_id, origin="python"
+                )
+
+            self._send(func, [call_id])
+            return len(message)
+
+        return await self._request(send, timeout)
+
+    async def evaluate_js(self, script, timeout=None):
+        def send(call_id):
+            if self.batch_calls:
+                self._queue_call(call_id, script)
+                return len(script)
+
+            callback = self._js_callback([call_id])
+            func = lambda: self.ipc.call_js([(call_id, script)], callback)
+
+            if self._tracer:
+                func = self._tracer.wrap(
+                    "gui.call_js", func, call_id=call_id, origin="python"
+                )
+
+            self._send(func, [call_id])
+            return len(script)
+
+        return await self._request(send, timeout)
+
+    async def _request(self, send, timeout=None):
+        if self.max_pending_calls and len(self._future_map) >= self.max_pending_calls:
+            raise TooManyCallsError(f"more than {self.max_pending_calls} pending calls")
+
+        call_id = self._protocol.next_id()
+        future = self._future_map[call_id] = self._loop.create_future()
+        metrics = self._metrics
+        tracer = self._tracer
+        started = time.perf_counter() if metrics or tracer else None
+        size = send(call_id)
+
+        if metrics:
+            metrics.observe("js.pending", len(self._future_map), DEPTH_BUCKETS)
+            metrics.observe_size("ipc.sent.bytes", size)
+
+        try:
+            return await asyncio.wait_for(
+                future, self.call_timeout if timeout is None else timeout
+            )
+        except Exception:
+            if metrics:
+                metrics.count("js.errors")
+
+            raise
+        finally:
+            self._future_map.pop(call_id, None)
+            self._queued_ids.discard(call_id)
+
+            if metrics:
+                metrics.since("js.call.ms", started)
+
+            if tracer:
+                tracer.span("python.call", started, call_id=call_id, origin="python")
+
+    def serve_assets(self, root, origin="https://app.local", **options):
+        from webview2.assets import AssetServer
+
+        server = AssetServer(root, origin, **options)
+        self.gui.add_asset_server(server)
+        return server
 
     async def fetch_url(self, url):
         self.navigated.clear()
-        self.url = url
+        await self.navigate(url)
         await self.navigated.wait()
 
     async def fetch_js(self, url):
@@ -109,3 +789,51 @@ class Window:
 
     def add_cookie(self, name, value, domain=None, path=None):
         self.cookie_manager.add_cookie(name, value, domain, path)
+
+    async def add_cookies(self, cookies):
+        await self.cookie_manager.add_cookies_async(normalize(cookies))
+
+    async def delete_cookies(self, cookies=None):
+        await self.cookie_manager.delete_cookies_async(
+            None if cookies is None else normalize(cookies)
+        )
+
+    async def get_cookies(self, url=None):
+        future = self._loop.create_future()
+
+        def callback(result, is_exc):
+            self._loop.call_soon_threadsafe(
+                settle, future, None if is_exc else result, result if is_exc else None
+            )
+
+        await self.cookie_manager.get_cookies_async(url, callback)
+        return await future
+
+    async def save_cookies(self, filename, url=None):
+        save_netscape(await self.get_cookies(url), filename)
+
+    async def load_cookies(self, filename):
+        await self.add_cookies(load_netscape(filename))
+
+
+def broadcast(windows, topic, value):
+    payload = json.dumps(value)
+
+    for window in windows:
+        window._publish(topic, payload)
+
+
+class PreparedFunction:
+    def __init__(self, window, handle, source):
+        self.window = window
+        self.handle = handle
+        self.source = source
+
+    async def __call__(self, *args, timeout=None):
+        return await self.window._call_prepared(self, args, timeout)
+
+    def script(self):
+        return f"webview._prepare({self.handle}, (\n{self.source}\n))"
+
+    def release(self):
+        self.window._release_prepared(self)